@@ -0,0 +1,58 @@
+"""hot path indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 05:27:35.301800
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0002'
+down_revision: Union[str, None] = '0001'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_cart_items_cart_id'), 'cart_items', ['cart_id'], unique=False)
+    op.create_index(op.f('ix_contacts_user_id'), 'contacts', ['user_id'], unique=False)
+    op.create_index(op.f('ix_discounts_name'), 'discounts', ['name'], unique=False)
+    op.create_index(op.f('ix_invoice_lines_invoice_id'), 'invoice_lines', ['invoice_id'], unique=False)
+    op.create_index(op.f('ix_invoices_customer_id'), 'invoices', ['customer_id'], unique=False)
+    op.create_index('ix_invoices_status_due_date', 'invoices', ['status', 'due_date'], unique=False)
+    op.create_index(op.f('ix_invoices_subscription_id'), 'invoices', ['subscription_id'], unique=False)
+    op.create_index(op.f('ix_payments_invoice_id'), 'payments', ['invoice_id'], unique=False)
+    op.create_index(op.f('ix_payments_payment_date'), 'payments', ['payment_date'], unique=False)
+    op.create_index(op.f('ix_payments_user_id'), 'payments', ['user_id'], unique=False)
+    op.create_index(op.f('ix_product_variants_product_id'), 'product_variants', ['product_id'], unique=False)
+    op.create_index('ix_products_active_name', 'products', ['name'], unique=False, postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active = 1'))
+    op.create_index('ix_products_active_product_type', 'products', ['product_type'], unique=False, postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active = 1'))
+    op.create_index(op.f('ix_subscription_lines_subscription_id'), 'subscription_lines', ['subscription_id'], unique=False)
+    op.create_index(op.f('ix_subscriptions_customer_id'), 'subscriptions', ['customer_id'], unique=False)
+    op.create_index(op.f('ix_subscriptions_parent_id'), 'subscriptions', ['parent_id'], unique=False)
+    op.create_index('ix_subscriptions_status_next_invoice_date', 'subscriptions', ['status', 'next_invoice_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_subscriptions_status_next_invoice_date', table_name='subscriptions')
+    op.drop_index(op.f('ix_subscriptions_parent_id'), table_name='subscriptions')
+    op.drop_index(op.f('ix_subscriptions_customer_id'), table_name='subscriptions')
+    op.drop_index(op.f('ix_subscription_lines_subscription_id'), table_name='subscription_lines')
+    op.drop_index('ix_products_active_product_type', table_name='products', postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active = 1'))
+    op.drop_index('ix_products_active_name', table_name='products', postgresql_where=sa.text('is_active'), sqlite_where=sa.text('is_active = 1'))
+    op.drop_index(op.f('ix_product_variants_product_id'), table_name='product_variants')
+    op.drop_index(op.f('ix_payments_user_id'), table_name='payments')
+    op.drop_index(op.f('ix_payments_payment_date'), table_name='payments')
+    op.drop_index(op.f('ix_payments_invoice_id'), table_name='payments')
+    op.drop_index(op.f('ix_invoices_subscription_id'), table_name='invoices')
+    op.drop_index('ix_invoices_status_due_date', table_name='invoices')
+    op.drop_index(op.f('ix_invoices_customer_id'), table_name='invoices')
+    op.drop_index(op.f('ix_invoice_lines_invoice_id'), table_name='invoice_lines')
+    op.drop_index(op.f('ix_discounts_name'), table_name='discounts')
+    op.drop_index(op.f('ix_contacts_user_id'), table_name='contacts')
+    op.drop_index(op.f('ix_cart_items_cart_id'), table_name='cart_items')
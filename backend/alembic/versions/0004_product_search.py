@@ -0,0 +1,39 @@
+"""product search index
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:41:07.226915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0004'
+down_revision: Union[str, None] = '0003'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Must match app.services.search_service.search_vector()
+SEARCH_VECTOR = (
+    "(setweight(to_tsvector('simple'::regconfig, coalesce(name, '')), 'A')"
+    " || setweight(to_tsvector('simple'::regconfig, coalesce(category, '')), 'B'))"
+    " || setweight(to_tsvector('simple'::regconfig, coalesce(description, '')), 'C')"
+)
+
+
+def upgrade() -> None:
+    # Full-text search is Postgres only; other databases use the in-memory index
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.create_index('ix_products_search', 'products', [sa.text(f'({SEARCH_VECTOR})')], unique=False,
+                    postgresql_using='gin', postgresql_where=sa.text('is_active'))
+
+
+def downgrade() -> None:
+    if op.get_context().dialect.name != 'postgresql':
+        return
+    op.drop_index('ix_products_search', table_name='products')
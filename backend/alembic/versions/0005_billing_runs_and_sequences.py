@@ -0,0 +1,73 @@
+"""billing runs and document sequences
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 13:05:41.702114
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0005'
+down_revision: Union[str, None] = '0004'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Databases built from an earlier copy of 0001 already have these tables
+    existing = set() if context.is_offline_mode() else set(sa.inspect(op.get_bind()).get_table_names())
+    if 'billing_runs' not in existing:
+        op.create_table('billing_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('run_date', sa.Date(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', name='billingrunstatus'), nullable=False),
+        sa.Column('partition_count', sa.Integer(), nullable=False),
+        sa.Column('chunk_size', sa.Integer(), nullable=False),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('run_date')
+        )
+        op.create_index(op.f('ix_billing_runs_id'), 'billing_runs', ['id'], unique=False)
+    if 'billing_run_partitions' not in existing:
+        op.create_table('billing_run_partitions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('partition_no', sa.Integer(), nullable=False),
+        sa.Column('status', sa.Enum('PENDING', 'RUNNING', 'COMPLETED', name='billingrunstatus'), nullable=False),
+        sa.Column('worker_id', sa.String(length=255), nullable=True),
+        sa.Column('heartbeat_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('last_subscription_id', sa.Integer(), nullable=False),
+        sa.Column('invoices_created', sa.Integer(), nullable=False),
+        sa.Column('total_amount', sa.Numeric(precision=14, scale=2), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.ForeignKeyConstraint(['run_id'], ['billing_runs.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('run_id', 'partition_no')
+        )
+        op.create_index(op.f('ix_billing_run_partitions_id'), 'billing_run_partitions', ['id'], unique=False)
+    if 'document_sequences' not in existing:
+        op.create_table('document_sequences',
+        sa.Column('key', sa.String(length=50), nullable=False),
+        sa.Column('last_value', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint('key')
+        )
+
+
+def downgrade() -> None:
+    op.drop_table('document_sequences')
+    op.drop_index(op.f('ix_billing_run_partitions_id'), table_name='billing_run_partitions')
+    op.drop_table('billing_run_partitions')
+    op.drop_index(op.f('ix_billing_runs_id'), table_name='billing_runs')
+    op.drop_table('billing_runs')
+    if op.get_context().dialect.name == "postgresql":
+        op.execute("DROP TYPE IF EXISTS billingrunstatus")
@@ -0,0 +1,37 @@
+"""table versions
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 21:40:12.304871
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '0006'
+down_revision: Union[str, None] = '0005'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    table_versions = op.create_table('table_versions',
+    sa.Column('table_name', sa.String(length=100), nullable=False),
+    sa.Column('version', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+    # Seeded so the first write to each table only has to update its row
+    op.bulk_insert(table_versions, [
+        {'table_name': name, 'version': 1}
+        for name in ('products', 'product_variants', 'recurring_plans', 'taxes', 'discounts')
+    ])
+
+
+def downgrade() -> None:
+    op.drop_table('table_versions')
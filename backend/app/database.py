@@ -1,8 +1,167 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import threading
+import time
+
+from sqlalchemy import Select, create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session, sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.config import settings
 
-engine = create_engine(settings.DATABASE_URL)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class PoolMetrics:
+    """Counters for how long requests wait to get a pooled connection."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record(self, waited: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            attempts = max(self.checkouts + self.timeouts, 1)
+            return {
+                "checkouts_total": self.checkouts,
+                "checkout_timeouts_total": self.timeouts,
+                "wait_ms_avg": round(self.wait_seconds_total * 1000 / attempts, 3),
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool with its own checkout wait metrics."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def recreate(self):
+        pool = super().recreate()
+        # Keep counting across dispose()/invalidation
+        pool.metrics = self.metrics
+        return pool
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            conn = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.record(time.perf_counter() - started, timed_out=True)
+            raise
+        self.metrics.record(time.perf_counter() - started)
+        return conn
+
+
+class InstrumentedAsyncQueuePool(InstrumentedQueuePool, AsyncAdaptedQueuePool):
+    pass
+
+
+class RoutingSession(Session):
+    """Sends plain SELECTs to the read replica when the session is marked for it."""
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        replica = self.info.get("replica_bind")
+        if replica is not None and self.info.get("use_replica"):
+            if self._flushing:
+                # Anything read after a write has to see it
+                self.info["use_replica"] = False
+            elif isinstance(clause, Select) and clause._for_update_arg is None:
+                return replica
+        return super().get_bind(mapper, clause=clause, **kw)
+
+
+def _async_database_url(url: str) -> str:
+    for sync_prefix, async_prefix in (
+        ("postgresql+psycopg2://", "postgresql+asyncpg://"),
+        ("postgresql://", "postgresql+asyncpg://"),
+        ("sqlite://", "sqlite+aiosqlite://"),
+    ):
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+def _engine_options(url: str, is_async: bool = False) -> dict:
+    if url.startswith("sqlite") and (":memory:" in url or url.rstrip("/") == "sqlite:"):
+        # In-memory SQLite needs its single-connection pool
+        return {}
+    options = {
+        "poolclass": InstrumentedAsyncQueuePool if is_async else InstrumentedQueuePool,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if settings.DB_STATEMENT_TIMEOUT_MS and url.startswith("postgresql+asyncpg"):
+        options["connect_args"] = {"server_settings": {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}}
+    elif settings.DB_STATEMENT_TIMEOUT_MS and url.startswith("postgresql"):
+        options["connect_args"] = {"options": f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"}
+    return options
+
+
+def _pool_status(pool) -> dict:
+    status = {"pool_class": type(pool).__name__}
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update({
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "checked_in": pool.checkedin(),
+            "overflow": pool.overflow(),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "timeout_seconds": settings.DB_POOL_TIMEOUT,
+        })
+        status.update(pool.metrics.snapshot())
+    return status
+
+
+def get_pool_status() -> dict:
+    """Pool state and checkout wait metrics for each configured engine."""
+    engines = {
+        "primary": engine,
+        "replica": replica_engine,
+        "async": async_engine,
+        "async_replica": async_replica_engine,
+    }
+    return {name: _pool_status(eng.pool) for name, eng in engines.items() if eng is not None}
+
+
+engine = create_engine(settings.DATABASE_URL, **_engine_options(settings.DATABASE_URL))
+replica_engine = None
+if settings.REPLICA_DATABASE_URL:
+    replica_engine = create_engine(settings.REPLICA_DATABASE_URL, **_engine_options(settings.REPLICA_DATABASE_URL))
+SessionLocal = sessionmaker(
+    class_=RoutingSession, autocommit=False, autoflush=False, bind=engine,
+    info={"replica_bind": replica_engine},
+)
 Base = declarative_base()
+
+# Optional asyncio engine (asyncpg on Postgres) for the async read routes
+async_engine = None
+async_replica_engine = None
+AsyncSessionLocal = None
+if settings.ASYNC_DB_ENABLED:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    _async_url = settings.ASYNC_DATABASE_URL or _async_database_url(settings.DATABASE_URL)
+    async_engine = create_async_engine(_async_url, **_engine_options(_async_url, is_async=True))
+    if settings.REPLICA_DATABASE_URL:
+        _async_replica_url = _async_database_url(settings.REPLICA_DATABASE_URL)
+        async_replica_engine = create_async_engine(
+            _async_replica_url, **_engine_options(_async_replica_url, is_async=True)
+        )
+    AsyncSessionLocal = async_sessionmaker(
+        async_engine, sync_session_class=RoutingSession, autoflush=False, expire_on_commit=False,
+        info={"replica_bind": async_replica_engine.sync_engine if async_replica_engine else None},
+    )
@@ -1,46 +1,117 @@
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from jose import JWTError
 
-from app.database import SessionLocal
+from app.database import AsyncSessionLocal, SessionLocal
+from app.services.api_key_service import API_KEY_PREFIX, api_key_table, scope_allows
 from app.services.auth_service import decode_token
 from app.models.user import User
 from app.enums import UserRole
+from app.utils.principal_cache import principal_cache
+from app.utils.read_routing import reads_from_replica
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
 
-def get_db():
+def get_db(request: Request):
     db = SessionLocal()
+    db.info["use_replica"] = reads_from_replica(request)
     try:
         yield db
     finally:
         db.close()
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db),
-) -> User:
-    credentials_exception = HTTPException(
+def get_primary_db():
+    """For GET handlers that write (or must never see replica lag)."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db(request: Request):
+    async with AsyncSessionLocal() as db:
+        db.info["use_replica"] = reads_from_replica(request)
+        yield db
+
+
+def _credentials_exception() -> HTTPException:
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+
+def _decode_access_token(token: str) -> tuple[int, int]:
+    """Return (user id, issued-at) from a valid access token."""
     try:
         payload = decode_token(token)
         if payload.get("type") != "access":
-            raise credentials_exception
+            raise _credentials_exception()
         user_id: int = int(payload.get("sub"))
         if user_id is None:
-            raise credentials_exception
+            raise _credentials_exception()
     except JWTError:
-        raise credentials_exception
+        raise _credentials_exception()
+    return user_id, int(payload.get("iat", 0))
+
+
+def _authenticate(request: Request, token: str) -> tuple[int, int]:
+    """Return (user id, issued-at) for a JWT or an API key (issued-at 0)."""
+    if not token.startswith(API_KEY_PREFIX):
+        return _decode_access_token(token)
+    principal = api_key_table.verify(token)
+    if principal is None:
+        raise _credentials_exception()
+    user_id, scopes = principal
+    if not scope_allows(scopes, request.method, request.url.path):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="API key scope does not allow this request",
+        )
+    return user_id, 0
+
 
+def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(get_db),
+) -> User:
+    user_id, issued_at = _authenticate(request, token)
+    if principal_cache.enabled:
+        user = principal_cache.get(user_id, issued_at)
+        if user is not None:
+            db.add(user)
+            return user
     user = db.query(User).filter(User.id == user_id).first()
     if user is None or not user.is_active:
-        raise credentials_exception
+        raise _credentials_exception()
+    if principal_cache.enabled:
+        principal_cache.put(user_id, issued_at, user)
+    return user
+
+
+async def get_current_user_async(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    user_id, issued_at = _authenticate(request, token)
+    if principal_cache.enabled:
+        user = principal_cache.get(user_id, issued_at)
+        if user is not None:
+            db.add(user)
+            return user
+    user = await db.get(User, user_id)
+    if user is None or not user.is_active:
+        raise _credentials_exception()
+    if principal_cache.enabled:
+        principal_cache.put(user_id, issued_at, user)
     return user
 
 
@@ -53,3 +124,14 @@ def require_role(*roles: UserRole):
             )
         return current_user
     return role_checker
+
+
+def require_role_async(*roles: UserRole):
+    async def role_checker(current_user: User = Depends(get_current_user_async)):
+        if current_user.role not in roles:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Insufficient permissions",
+            )
+        return current_user
+    return role_checker
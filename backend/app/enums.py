@@ -39,3 +39,9 @@ class ProductType(str, enum.Enum):
     CONSUMABLE = "consumable"
     SERVICE = "service"
     SUBSCRIPTION = "subscription"
+
+
+class BillingRunStatus(str, enum.Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
@@ -9,6 +9,10 @@ from app.models.discount import Discount
 from app.models.tax import Tax
 from app.models.cart import Cart, CartItem
 from app.models.contact import Contact
+from app.models.billing_run import BillingRun, BillingRunPartition
+from app.models.document_sequence import DocumentSequence
+from app.models.api_key import ApiKey
+from app.models.table_version import TableVersion
 
 __all__ = [
     "User",
@@ -22,4 +26,8 @@ __all__ = [
     "Tax",
     "Cart", "CartItem",
     "Contact",
+    "BillingRun", "BillingRunPartition",
+    "DocumentSequence",
+    "ApiKey",
+    "TableVersion",
 ]
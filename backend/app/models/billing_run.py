@@ -0,0 +1,38 @@
+from sqlalchemy import Column, Integer, String, Numeric, Date, DateTime, ForeignKey, UniqueConstraint, Enum as SAEnum
+from sqlalchemy.orm import relationship
+
+from app.database import Base
+from app.models.base import TimestampMixin
+from app.enums import BillingRunStatus
+
+
+class BillingRun(TimestampMixin, Base):
+    __tablename__ = "billing_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_date = Column(Date, unique=True, nullable=False)
+    status = Column(SAEnum(BillingRunStatus), nullable=False, default=BillingRunStatus.RUNNING)
+    partition_count = Column(Integer, nullable=False, default=1)
+    chunk_size = Column(Integer, nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    partitions = relationship("BillingRunPartition", back_populates="run",
+                              cascade="all, delete-orphan",
+                              order_by="BillingRunPartition.partition_no")
+
+
+class BillingRunPartition(TimestampMixin, Base):
+    __tablename__ = "billing_run_partitions"
+    __table_args__ = (UniqueConstraint("run_id", "partition_no"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("billing_runs.id", ondelete="CASCADE"), nullable=False)
+    partition_no = Column(Integer, nullable=False)
+    status = Column(SAEnum(BillingRunStatus), nullable=False, default=BillingRunStatus.PENDING)
+    worker_id = Column(String(255), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    last_subscription_id = Column(Integer, nullable=False, default=0)
+    invoices_created = Column(Integer, nullable=False, default=0)
+    total_amount = Column(Numeric(14, 2), nullable=False, default=0)
+
+    run = relationship("BillingRun", back_populates="partitions")
@@ -19,7 +19,7 @@ class Discount(TimestampMixin, Base):
     __tablename__ = "discounts"
 
     id = Column(Integer, primary_key=True, index=True)
-    name = Column(String(255), nullable=False)
+    name = Column(String(255), nullable=False, index=True)
     discount_type = Column(SAEnum(DiscountType), nullable=False)
     value = Column(Numeric(12, 2), nullable=False)
     min_purchase = Column(Numeric(12, 2), nullable=True, default=0)
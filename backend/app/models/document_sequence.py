@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, String
+
+from app.database import Base
+from app.models.base import TimestampMixin
+
+
+class DocumentSequence(TimestampMixin, Base):
+    __tablename__ = "document_sequences"
+
+    key = Column(String(50), primary_key=True)
+    last_value = Column(Integer, nullable=False, default=0)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, Date, ForeignKey, Text, Enum as SAEnum
+from sqlalchemy import Column, Integer, String, Numeric, Date, ForeignKey, Text, Index, Enum as SAEnum
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -8,11 +8,14 @@ from app.enums import InvoiceStatus
 
 class Invoice(TimestampMixin, Base):
     __tablename__ = "invoices"
+    __table_args__ = (
+        Index("ix_invoices_status_due_date", "status", "due_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     invoice_number = Column(String(50), unique=True, nullable=False, index=True)
-    subscription_id = Column(Integer, ForeignKey("subscriptions.id"), nullable=False)
-    customer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    subscription_id = Column(Integer, ForeignKey("subscriptions.id"), nullable=False, index=True)
+    customer_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     issue_date = Column(Date, nullable=False)
     due_date = Column(Date, nullable=True)
     status = Column(SAEnum(InvoiceStatus), nullable=False, default=InvoiceStatus.DRAFT)
@@ -33,7 +36,8 @@ class InvoiceLine(TimestampMixin, Base):
     __tablename__ = "invoice_lines"
 
     id = Column(Integer, primary_key=True, index=True)
-    invoice_id = Column(Integer, ForeignKey("invoices.id", ondelete="CASCADE"), nullable=False)
+    invoice_id = Column(Integer, ForeignKey("invoices.id", ondelete="CASCADE"), nullable=False,
+                        index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     description = Column(String(500), nullable=True)
     quantity = Column(Integer, nullable=False, default=1)
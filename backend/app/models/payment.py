@@ -9,11 +9,11 @@ class Payment(TimestampMixin, Base):
     __tablename__ = "payments"
 
     id = Column(Integer, primary_key=True, index=True)
-    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    invoice_id = Column(Integer, ForeignKey("invoices.id"), nullable=False, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     payment_method = Column(String(100), nullable=False)
     amount = Column(Numeric(12, 2), nullable=False)
-    payment_date = Column(Date, nullable=False)
+    payment_date = Column(Date, nullable=False, index=True)
     reference = Column(String(255), nullable=True)
     notes = Column(Text, nullable=True)
 
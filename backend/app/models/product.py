@@ -1,13 +1,21 @@
-from sqlalchemy import Column, Integer, String, Numeric, Boolean, ForeignKey, Enum as SAEnum, Text
+from sqlalchemy import Column, Integer, String, Numeric, Boolean, ForeignKey, Index, Enum as SAEnum, Text, text
 from sqlalchemy.orm import relationship
 
 from app.database import Base
 from app.models.base import TimestampMixin
 from app.enums import ProductType
+from app.utils.uploads import image_variants
 
 
 class Product(TimestampMixin, Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Storefront queries only ever look at active products
+        Index("ix_products_active_name", "name",
+              postgresql_where=text("is_active"), sqlite_where=text("is_active = 1")),
+        Index("ix_products_active_product_type", "product_type",
+              postgresql_where=text("is_active"), sqlite_where=text("is_active = 1")),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -25,12 +33,17 @@ class Product(TimestampMixin, Base):
     variants = relationship("ProductVariant", back_populates="product",
                             cascade="all, delete-orphan")
 
+    @property
+    def image_variants(self) -> dict[str, str]:
+        return image_variants(self.image_url)
+
 
 class ProductVariant(TimestampMixin, Base):
     __tablename__ = "product_variants"
 
     id = Column(Integer, primary_key=True, index=True)
-    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False,
+                        index=True)
     attribute = Column(String(255), nullable=False)
     value = Column(String(255), nullable=False)
     extra_price = Column(Numeric(12, 2), nullable=False, default=0)
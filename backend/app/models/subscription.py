@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Numeric, Date, ForeignKey, Text, Enum as SAEnum
+from sqlalchemy import Column, Integer, String, Numeric, Date, ForeignKey, Text, Index, Enum as SAEnum
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -8,13 +8,16 @@ from app.enums import SubscriptionStatus
 
 class Subscription(TimestampMixin, Base):
     __tablename__ = "subscriptions"
+    __table_args__ = (
+        Index("ix_subscriptions_status_next_invoice_date", "status", "next_invoice_date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     subscription_number = Column(String(50), unique=True, nullable=False, index=True)
-    customer_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    customer_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
     plan_id = Column(Integer, ForeignKey("recurring_plans.id"), nullable=False)
     salesperson_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    parent_id = Column(Integer, ForeignKey("subscriptions.id"), nullable=True)
+    parent_id = Column(Integer, ForeignKey("subscriptions.id"), nullable=True, index=True)
     start_date = Column(Date, nullable=False)
     expiration_date = Column(Date, nullable=True)
     payment_terms = Column(String(255), nullable=True)
@@ -37,7 +40,7 @@ class SubscriptionLine(TimestampMixin, Base):
 
     id = Column(Integer, primary_key=True, index=True)
     subscription_id = Column(Integer, ForeignKey("subscriptions.id", ondelete="CASCADE"),
-                             nullable=False)
+                             nullable=False, index=True)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity = Column(Integer, nullable=False, default=1)
     unit_price = Column(Numeric(12, 2), nullable=False)
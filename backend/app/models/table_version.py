@@ -0,0 +1,58 @@
+from sqlalchemy import BigInteger, Column, String, event, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.database import Base
+from app.models.base import TimestampMixin
+
+# Tables whose responses are cached by version (ETags, catalog snapshot)
+VERSIONED_TABLES = frozenset({"products", "product_variants", "recurring_plans", "taxes", "discounts"})
+
+
+class TableVersion(TimestampMixin, Base):
+    """Change counter per cached table, bumped in the same transaction as the write."""
+
+    __tablename__ = "table_versions"
+
+    table_name = Column(String(100), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+
+
+def bump_table_versions(connection, table_names):
+    names = sorted(set(table_names) & VERSIONED_TABLES)
+    if not names:
+        return
+    table = TableVersion.__table__
+    result = connection.execute(
+        update(table).where(table.c.table_name.in_(names)).values(version=table.c.version + 1)
+    )
+    if result.rowcount < len(names):
+        existing = set(connection.execute(
+            select(table.c.table_name).where(table.c.table_name.in_(names))
+        ).scalars())
+        connection.execute(insert(table), [
+            {"table_name": name, "version": 1} for name in names if name not in existing
+        ])
+
+
+# Registered with the models rather than the HTTP layer so CLIs and workers that
+# write through a Session bump the counters too. The changed table names are
+# also left in session.info for the per-worker caches to drop after commit.
+@event.listens_for(Session, "after_flush")
+def _bump_flushed_tables(session, flush_context):
+    names = {table.name for obj in (*session.new, *session.dirty, *session.deleted)
+             for table in obj.__mapper__.tables}
+    if names:
+        session.info.setdefault("changed_tables", set()).update(names)
+        bump_table_versions(session.connection(), names)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bump_bulk_tables(orm_execute_state):
+    # Bulk update()/delete()/insert() statements skip the flush
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete or orm_execute_state.is_insert):
+        return
+    table = getattr(orm_execute_state.statement, "table", None)
+    if table is not None and table.name in VERSIONED_TABLES:
+        session = orm_execute_state.session
+        session.info.setdefault("changed_tables", set()).add(table.name)
+        bump_table_versions(session.connection(), [table.name])
@@ -1,14 +1,19 @@
 from fastapi import APIRouter
 
+from app.config import settings
 from app.routes import (
     auth, users, products, product_variants, recurring_plans,
     subscriptions, invoices, payments, discounts, taxes,
     quotation_templates, reports,
-    cart, checkout, contacts,
+    cart, checkout, contacts, billing, metrics, async_reads, api_keys,
 )
 
 api_router = APIRouter(prefix="/api")
 
+# Async read routes shadow their sync twins (same paths and schemas) when enabled
+if settings.ASYNC_DB_ENABLED:
+    api_router.include_router(async_reads.router, include_in_schema=False)
+
 api_router.include_router(auth.router, prefix="/auth", tags=["Authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["Users"])
 api_router.include_router(products.router, prefix="/products", tags=["Products"])
@@ -24,3 +29,6 @@ api_router.include_router(reports.router, prefix="/reports", tags=["Reports"])
 api_router.include_router(cart.router, prefix="/cart", tags=["Cart"])
 api_router.include_router(checkout.router, prefix="/checkout", tags=["Checkout"])
 api_router.include_router(contacts.router, prefix="/contacts", tags=["Contacts"])
+api_router.include_router(billing.router, prefix="/billing", tags=["Billing"])
+api_router.include_router(metrics.router, prefix="/metrics", tags=["Metrics"])
+api_router.include_router(api_keys.router, prefix="/api-keys", tags=["API Keys"])
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
+
+from app.dependencies import get_db, require_role
+from app.models.user import User
+from app.enums import UserRole
+from app.schemas.api_key import ApiKeyCreate, ApiKeyOut, ApiKeyCreated
+from app.services import api_key_service
+
+router = APIRouter()
+
+
+@router.post("/", response_model=ApiKeyCreated, status_code=status.HTTP_201_CREATED)
+def create_api_key(
+    data: ApiKeyCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+):
+    key, api_key = api_key_service.create_api_key(db, data)
+    return ApiKeyCreated(**ApiKeyOut.model_validate(key).model_dump(), api_key=api_key)
+
+
+@router.get("/", response_model=list[ApiKeyOut])
+def list_api_keys(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+):
+    return api_key_service.get_api_keys(db, skip, limit)
+
+
+@router.delete("/{api_key_id}", response_model=ApiKeyOut)
+def revoke_api_key(
+    api_key_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+):
+    return api_key_service.revoke_api_key(db, api_key_id)
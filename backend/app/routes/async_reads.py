@@ -0,0 +1,149 @@
+from datetime import date
+
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.dependencies import get_async_db, get_current_user_async, require_role_async
+from app.models.user import User
+from app.enums import UserRole
+from app.schemas.auth import UserOut
+from app.schemas.product import ProductOut, ProductSearchOut
+from app.schemas.subscription import SubscriptionOut
+from app.schemas.invoice import InvoiceOut
+from app.services import product_service, search_service, subscription_service, invoice_service, report_service
+from app.services.catalog_snapshot import catalog_snapshot
+from app.models.product import Product, ProductVariant
+from app.utils.conditional import conditional_get
+from app.utils.pagination import set_next_cursor
+from app.utils.serialization import trusted_response
+
+router = APIRouter()
+
+staff_only = require_role_async(UserRole.ADMIN, UserRole.INTERNAL)
+
+
+@router.get("/auth/me", response_model=UserOut)
+async def get_me_async(current_user: User = Depends(get_current_user_async)):
+    return current_user
+
+
+@router.get("/products/public", response_model=list[ProductOut],
+            dependencies=[Depends(conditional_get(Product, ProductVariant, public=True))])
+async def list_public_products_async(
+    request: Request,
+    response: Response,
+    search: str | None = None,
+    product_type: str | None = None,
+    category: str | None = None,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_async_db),
+):
+    if not search and settings.CATALOG_SNAPSHOT_ENABLED:
+        return await db.run_sync(
+            catalog_snapshot.response, request, response, product_type, category, skip, limit, cursor
+        )
+    products = await db.run_sync(
+        product_service.get_public_products, search, product_type, skip, limit, cursor, category
+    )
+    set_next_cursor(response, products, limit)
+    return trusted_response(products, ProductOut, response)
+
+
+@router.get("/products/public/search", response_model=ProductSearchOut)
+async def search_public_products_async(
+    q: str | None = None,
+    category: str | None = None,
+    product_type: str | None = None,
+    offset: int = 0,
+    limit: int = 20,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(search_service.search_products, q, category, product_type, offset, limit)
+
+
+@router.get("/products/public/{product_id}", response_model=ProductOut,
+            dependencies=[Depends(conditional_get(Product, ProductVariant, public=True))])
+async def get_public_product_async(
+    product_id: int,
+    db: AsyncSession = Depends(get_async_db),
+):
+    return await db.run_sync(product_service.get_public_product, product_id)
+
+
+@router.get("/subscriptions/", response_model=list[SubscriptionOut])
+async def list_subscriptions_async(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    status: str | None = None,
+    customer_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    if current_user.role == UserRole.PORTAL:
+        customer_id = current_user.id
+    subs = await db.run_sync(
+        subscription_service.get_subscriptions, skip, limit, status, customer_id, cursor
+    )
+    set_next_cursor(response, subs, limit)
+    return trusted_response(subs, SubscriptionOut, response)
+
+
+@router.get("/invoices/", response_model=list[InvoiceOut])
+async def list_invoices_async(
+    response: Response,
+    skip: int = 0,
+    limit: int = 100,
+    cursor: str | None = None,
+    status: str | None = None,
+    customer_id: int | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user_async),
+):
+    if current_user.role == UserRole.PORTAL:
+        customer_id = current_user.id
+    invoices = await db.run_sync(
+        invoice_service.get_invoices, skip, limit, status, customer_id, cursor
+    )
+    set_next_cursor(response, invoices, limit)
+    return trusted_response(invoices, InvoiceOut, response)
+
+
+@router.get("/reports/active-subscriptions")
+async def active_subscriptions_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(staff_only),
+):
+    return await db.run_sync(report_service.get_active_subscriptions)
+
+
+@router.get("/reports/revenue")
+async def revenue_async(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(staff_only),
+):
+    return await db.run_sync(report_service.get_revenue, start_date, end_date)
+
+
+@router.get("/reports/payments-summary")
+async def payments_summary_async(
+    start_date: date | None = None,
+    end_date: date | None = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(staff_only),
+):
+    return await db.run_sync(report_service.get_payments_summary, start_date, end_date)
+
+
+@router.get("/reports/overdue-invoices")
+async def overdue_invoices_async(
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(staff_only),
+):
+    return await db.run_sync(report_service.get_overdue_invoices)
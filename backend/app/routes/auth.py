@@ -1,5 +1,3 @@
-import threading
-
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
 from jose import JWTError
@@ -17,15 +15,20 @@ from app.services.auth_service import (
     create_refresh_token, decode_token,
 )
 from app.services.firebase_service import (
-    verify_firebase_token, ensure_firebase_user, ensure_firebase_user_with_password,
-    verify_firebase_password,
+    verify_firebase_token, ensure_firebase_user, verify_firebase_password,
 )
+from app.services.firebase_sync import password_sync_queue
 from app.utils.password import validate_password
+from app.utils.principal_cache import principal_cache
+from app.utils.rate_limit import auth_rate_limit
 
 router = APIRouter()
 
 
-@router.post("/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/signup", response_model=UserOut, status_code=status.HTTP_201_CREATED,
+    dependencies=[Depends(auth_rate_limit)],
+)
 def signup(data: SignupRequest, db: Session = Depends(get_db)):
     existing = db.query(User).filter(User.email == data.email).first()
     if existing:
@@ -45,7 +48,7 @@ def signup(data: SignupRequest, db: Session = Depends(get_db)):
     return user
 
 
-@router.post("/login", response_model=LoginResponse)
+@router.post("/login", response_model=LoginResponse, dependencies=[Depends(auth_rate_limit)])
 def login(data: LoginRequest, db: Session = Depends(get_db)):
     user = db.query(User).filter(User.email == data.email).first()
     if not user:
@@ -65,6 +68,7 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
             # Sync new password to local DB
             user.hashed_password = hash_password(data.password)
             db.commit()
+            principal_cache.invalidate(user.id)
         else:
             raise HTTPException(status_code=401, detail="Invalid email or password")
 
@@ -72,11 +76,7 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=403, detail="Account is deactivated")
 
     # Sync password to Firebase Auth in background (non-blocking)
-    threading.Thread(
-        target=ensure_firebase_user_with_password,
-        args=(data.email, data.password),
-        daemon=True,
-    ).start()
+    password_sync_queue.submit(data.email, data.password, user.hashed_password)
 
     token_data = {"sub": str(user.id), "role": user.role.value}
     return LoginResponse(
@@ -86,7 +86,7 @@ def login(data: LoginRequest, db: Session = Depends(get_db)):
     )
 
 
-@router.post("/firebase", response_model=LoginResponse)
+@router.post("/firebase", response_model=LoginResponse, dependencies=[Depends(auth_rate_limit)])
 def firebase_auth(data: FirebaseAuthRequest, db: Session = Depends(get_db)):
     """Verify a Firebase ID token (email/password or Google via Firebase) and find or create the user."""
     try:
@@ -108,6 +108,7 @@ def firebase_auth(data: FirebaseAuthRequest, db: Session = Depends(get_db)):
         if not user.oauth_provider:
             user.oauth_provider = provider
             db.commit()
+            principal_cache.invalidate(user.id)
             db.refresh(user)
     else:
         # Create new user from Firebase token
@@ -154,7 +155,7 @@ def refresh_token(data: RefreshRequest, db: Session = Depends(get_db)):
     )
 
 
-@router.post("/forgot-password")
+@router.post("/forgot-password", dependencies=[Depends(auth_rate_limit)])
 def forgot_password(data: ForgotPasswordRequest, db: Session = Depends(get_db)):
     """Check email exists in DB, ensure Firebase user so reset email can be sent."""
     user = db.query(User).filter(User.email == data.email).first()
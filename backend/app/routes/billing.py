@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy.orm import Session
+
+from app.dependencies import get_db, require_role
+from app.models.user import User
+from app.enums import UserRole
+from app.schemas.billing import BillingRunRequest, BillingRunSummary, BillingRunOut
+from app.services import billing_service
+
+router = APIRouter()
+
+
+@router.post("/run", response_model=BillingRunSummary)
+def run_billing(
+    data: BillingRunRequest | None = None,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+):
+    data = data or BillingRunRequest()
+    return billing_service.run_billing(db, data.run_date, data.chunk_size)
+
+
+@router.get("/runs", response_model=list[BillingRunOut])
+def list_runs(
+    skip: int = 0,
+    limit: int = 100,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.INTERNAL)),
+):
+    return billing_service.get_runs(db, skip, limit)
+
+
+@router.get("/runs/{run_id}", response_model=BillingRunOut)
+def get_run(
+    run_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.INTERNAL)),
+):
+    return billing_service.get_run(db, run_id)
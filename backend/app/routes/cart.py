@@ -1,7 +1,7 @@
 from fastapi import APIRouter, Depends, status
 from sqlalchemy.orm import Session
 
-from app.dependencies import get_db, get_current_user
+from app.dependencies import get_db, get_primary_db, get_current_user
 from app.models.user import User
 from app.schemas.cart import CartItemAdd, CartItemUpdate, CartOut
 from app.services import cart_service
@@ -11,7 +11,7 @@ router = APIRouter()
 
 @router.get("/", response_model=CartOut)
 def get_cart(
-    db: Session = Depends(get_db),
+    db: Session = Depends(get_primary_db),
     current_user: User = Depends(get_current_user),
 ):
     return cart_service.get_cart_with_details(db, current_user.id)
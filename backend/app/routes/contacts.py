@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_db, get_current_user, require_role
@@ -6,6 +6,7 @@ from app.models.user import User
 from app.models.contact import Contact
 from app.enums import UserRole
 from app.schemas.contact import ContactCreate, ContactUpdate, ContactOut
+from app.utils.pagination import paginate, set_next_cursor
 
 router = APIRouter()
 
@@ -25,8 +26,10 @@ def create_contact(
 
 @router.get("/", response_model=list[ContactOut])
 def list_contacts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     search: str | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
@@ -41,7 +44,9 @@ def list_contacts(
             Contact.email.ilike(search_filter) |
             Contact.company.ilike(search_filter)
         )
-    return query.offset(skip).limit(limit).all()
+    contacts = paginate(query, Contact, skip, limit, cursor)
+    set_next_cursor(response, contacts, limit)
+    return contacts
 
 
 @router.get("/{contact_id}", response_model=ContactOut)
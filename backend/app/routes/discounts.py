@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_db, get_current_user, require_role
@@ -7,6 +7,8 @@ from app.models.discount import Discount
 from app.enums import UserRole
 from app.schemas.discount import DiscountCreate, DiscountUpdate, DiscountOut
 from app.services import discount_service
+from app.utils.conditional import conditional_get
+from app.utils.pagination import set_next_cursor
 from pydantic import BaseModel
 from datetime import date
 from decimal import Decimal
@@ -72,12 +74,17 @@ def create_discount(
 
 @router.get("/", response_model=list[DiscountOut])
 def list_discounts(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.INTERNAL)),
+    not_modified: None = Depends(conditional_get(Discount)),
 ):
-    return discount_service.get_discounts(db, skip, limit)
+    discounts = discount_service.get_discounts(db, skip, limit, cursor)
+    set_next_cursor(response, discounts, limit)
+    return discounts
 
 
 @router.get("/{discount_id}", response_model=DiscountOut)
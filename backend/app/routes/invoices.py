@@ -10,6 +10,8 @@ from app.models.user import User
 from app.enums import UserRole
 from app.schemas.invoice import InvoiceOut
 from app.services import invoice_service
+from app.utils.pagination import set_next_cursor
+from app.utils.serialization import trusted_response
 
 router = APIRouter()
 
@@ -31,8 +33,10 @@ def generate_invoice(
 
 @router.get("/", response_model=list[InvoiceOut])
 def list_invoices(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     status: str | None = None,
     customer_id: int | None = None,
     db: Session = Depends(get_db),
@@ -40,7 +44,9 @@ def list_invoices(
 ):
     if current_user.role == UserRole.PORTAL:
         customer_id = current_user.id
-    return invoice_service.get_invoices(db, skip, limit, status, customer_id)
+    invoices = invoice_service.get_invoices(db, skip, limit, status, customer_id, cursor)
+    set_next_cursor(response, invoices, limit)
+    return trusted_response(invoices, InvoiceOut, response)
 
 
 @router.get("/{invoice_id}", response_model=InvoiceOut)
@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends
+
+from app.database import get_pool_status
+from app.dependencies import require_role
+from app.models.user import User
+from app.enums import UserRole
+from app.services.firebase_sync import password_sync_queue
+
+router = APIRouter()
+
+
+@router.get("/db-pool")
+def db_pool(
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+):
+    return get_pool_status()
+
+
+@router.get("/firebase-sync")
+def firebase_sync(
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+):
+    return password_sync_queue.snapshot()
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_db, get_current_user, require_role
@@ -6,6 +6,7 @@ from app.models.user import User
 from app.enums import UserRole
 from app.schemas.payment import PaymentCreate, PaymentOut
 from app.services import payment_service
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
@@ -21,8 +22,10 @@ def create_payment(
 
 @router.get("/", response_model=list[PaymentOut])
 def list_payments(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     invoice_id: int | None = None,
     customer_id: int | None = None,
     db: Session = Depends(get_db),
@@ -30,7 +33,9 @@ def list_payments(
 ):
     if current_user.role == UserRole.PORTAL:
         customer_id = current_user.id
-    return payment_service.get_payments(db, skip, limit, invoice_id, customer_id)
+    payments = payment_service.get_payments(db, skip, limit, invoice_id, customer_id, cursor)
+    set_next_cursor(response, payments, limit)
+    return payments
 
 
 @router.get("/{payment_id}", response_model=PaymentOut)
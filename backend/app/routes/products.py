@@ -1,49 +1,61 @@
-import os
-import uuid
-
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, UploadFile, File, status
 from sqlalchemy.orm import Session
 
+from app.config import settings
 from app.dependencies import get_db, get_current_user, require_role
 from app.models.user import User
 from app.models.product import Product, ProductVariant
 from app.models.recurring_plan import RecurringPlan
 from app.enums import UserRole
-from app.schemas.product import ProductCreate, ProductUpdate, ProductOut
-from app.services import product_service
-
-UPLOAD_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "uploads", "products")
-ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
-MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+from app.schemas.product import ProductCreate, ProductUpdate, ProductOut, ProductSearchOut
+from app.services import image_service, product_service, search_service
+from app.services.catalog_snapshot import catalog_snapshot
+from app.utils.conditional import conditional_get
+from app.utils.pagination import set_next_cursor
+from app.utils.serialization import trusted_response
 
 router = APIRouter()
 
 
-@router.get("/public", response_model=list[ProductOut])
+@router.get("/public", response_model=list[ProductOut],
+            dependencies=[Depends(conditional_get(Product, ProductVariant, public=True))])
 def list_public_products(
+    request: Request,
+    response: Response,
     search: str | None = None,
     product_type: str | None = None,
+    category: str | None = None,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     db: Session = Depends(get_db),
 ):
-    query = db.query(Product).filter(Product.is_active == True)
-    if search:
-        query = query.filter(Product.name.ilike(f"%{search}%"))
-    if product_type:
-        query = query.filter(Product.product_type == product_type)
-    return query.offset(skip).limit(limit).all()
+    if not search and settings.CATALOG_SNAPSHOT_ENABLED:
+        return catalog_snapshot.response(db, request, response, product_type, category, skip, limit, cursor)
+    products = product_service.get_public_products(db, search, product_type, skip, limit, cursor, category)
+    set_next_cursor(response, products, limit)
+    return trusted_response(products, ProductOut, response)
 
 
-@router.get("/public/{product_id}", response_model=ProductOut)
+@router.get("/public/search", response_model=ProductSearchOut)
+def search_public_products(
+    q: str | None = None,
+    category: str | None = None,
+    product_type: str | None = None,
+    offset: int = 0,
+    limit: int = 20,
+    db: Session = Depends(get_db),
+):
+    return search_service.search_products(db, q, category, product_type, offset, limit)
+
+
+@router.get("/public/{product_id}", response_model=ProductOut,
+            dependencies=[Depends(conditional_get(Product, ProductVariant, public=True))])
 def get_public_product(
     product_id: int,
     db: Session = Depends(get_db),
 ):
-    product = db.query(Product).filter(Product.id == product_id, Product.is_active == True).first()
-    if not product:
-        raise HTTPException(status_code=404, detail="Product not found")
-    return product
+    return product_service.get_public_product(db, product_id)
 
 
 @router.post("/", response_model=ProductOut, status_code=status.HTTP_201_CREATED)
@@ -57,12 +69,16 @@ def create_product(
 
 @router.get("/", response_model=list[ProductOut])
 def list_products(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
-    return product_service.get_products(db, skip, limit)
+    products = product_service.get_products(db, skip, limit, cursor)
+    set_next_cursor(response, products, limit)
+    return trusted_response(products, ProductOut, response)
 
 
 @router.get("/{product_id}", response_model=ProductOut)
@@ -95,39 +111,15 @@ def delete_product(
 
 
 @router.post("/{product_id}/image", response_model=ProductOut)
-async def upload_product_image(
+def upload_product_image(
     product_id: int,
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(UserRole.ADMIN)),
 ):
     product = product_service.get_product(db, product_id)
-
-    ext = os.path.splitext(file.filename or "")[1].lower()
-    if ext not in ALLOWED_EXTENSIONS:
-        raise HTTPException(status_code=400, detail=f"File type not allowed. Use: {', '.join(ALLOWED_EXTENSIONS)}")
-
-    contents = await file.read()
-    if len(contents) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail="File too large. Maximum 5MB.")
-
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-
-    # Remove old image if exists
-    if product.image_url:
-        old_abs = os.path.normpath(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), product.image_url.lstrip("/")))
-        if os.path.exists(old_abs):
-            os.remove(old_abs)
-
-    filename = f"{product_id}_{uuid.uuid4().hex[:8]}{ext}"
-    filepath = os.path.join(UPLOAD_DIR, filename)
-
-    with open(filepath, "wb") as f:
-        f.write(contents)
-
-    product.image_url = f"uploads/products/{filename}"
-    db.commit()
-    db.refresh(product)
+    product = image_service.set_product_image(db, product, file)
+    product_service.invalidate_catalog()
     return product
 
 
@@ -141,11 +133,10 @@ def delete_product_image(
     if not product.image_url:
         raise HTTPException(status_code=400, detail="Product has no image")
 
-    abs_path = os.path.normpath(os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), product.image_url.lstrip("/")))
-    if os.path.exists(abs_path):
-        os.remove(abs_path)
-
+    old_url = product.image_url
     product.image_url = None
     db.commit()
+    product_service.invalidate_catalog()
+    image_service.release_image(db, old_url)
     db.refresh(product)
     return product
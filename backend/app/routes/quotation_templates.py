@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_db, require_role
@@ -8,6 +8,7 @@ from app.schemas.quotation_template import (
     QuotationTemplateCreate, QuotationTemplateUpdate, QuotationTemplateOut,
 )
 from app.services import quotation_template_service
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
@@ -23,12 +24,16 @@ def create_template(
 
 @router.get("/", response_model=list[QuotationTemplateOut])
 def list_templates(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.INTERNAL)),
 ):
-    return quotation_template_service.get_templates(db, skip, limit)
+    templates = quotation_template_service.get_templates(db, skip, limit, cursor)
+    set_next_cursor(response, templates, limit)
+    return templates
 
 
 @router.get("/{template_id}", response_model=QuotationTemplateOut)
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_db, get_current_user, require_role
 from app.models.user import User
+from app.models.recurring_plan import RecurringPlan
 from app.enums import UserRole
 from app.schemas.recurring_plan import RecurringPlanCreate, RecurringPlanUpdate, RecurringPlanOut
 from app.services import recurring_plan_service
+from app.utils.conditional import conditional_get
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
@@ -21,12 +24,17 @@ def create_plan(
 
 @router.get("/", response_model=list[RecurringPlanOut])
 def list_plans(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
+    not_modified: None = Depends(conditional_get(RecurringPlan)),
 ):
-    return recurring_plan_service.get_plans(db, skip, limit)
+    plans = recurring_plan_service.get_plans(db, skip, limit, cursor)
+    set_next_cursor(response, plans, limit)
+    return plans
 
 
 @router.get("/{plan_id}", response_model=RecurringPlanOut)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Response, status
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_db, get_current_user, require_role
@@ -11,6 +11,8 @@ from app.schemas.subscription import (
 )
 from app.models.recurring_plan import RecurringPlan
 from app.services import subscription_service
+from app.utils.pagination import set_next_cursor
+from app.utils.serialization import trusted_response
 
 router = APIRouter()
 
@@ -26,8 +28,10 @@ def create_subscription(
 
 @router.get("/", response_model=list[SubscriptionOut])
 def list_subscriptions(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     status: str | None = None,
     customer_id: int | None = None,
     db: Session = Depends(get_db),
@@ -35,7 +39,9 @@ def list_subscriptions(
 ):
     if current_user.role == UserRole.PORTAL:
         customer_id = current_user.id
-    return subscription_service.get_subscriptions(db, skip, limit, status, customer_id)
+    subs = subscription_service.get_subscriptions(db, skip, limit, status, customer_id, cursor)
+    set_next_cursor(response, subs, limit)
+    return trusted_response(subs, SubscriptionOut, response)
 
 
 @router.get("/{sub_id}", response_model=SubscriptionOut)
@@ -1,11 +1,14 @@
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Response, status
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_db, require_role
 from app.models.user import User
+from app.models.tax import Tax
 from app.enums import UserRole
 from app.schemas.tax import TaxCreate, TaxUpdate, TaxOut
 from app.services import tax_service
+from app.utils.conditional import conditional_get
+from app.utils.pagination import set_next_cursor
 
 router = APIRouter()
 
@@ -21,12 +24,17 @@ def create_tax(
 
 @router.get("/", response_model=list[TaxOut])
 def list_taxes(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.INTERNAL)),
+    not_modified: None = Depends(conditional_get(Tax)),
 ):
-    return tax_service.get_taxes(db, skip, limit)
+    taxes = tax_service.get_taxes(db, skip, limit, cursor)
+    set_next_cursor(response, taxes, limit)
+    return taxes
 
 
 @router.get("/{tax_id}", response_model=TaxOut)
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, File, HTTPException, Response, UploadFile, status
 from sqlalchemy.orm import Session
 
 from app.dependencies import get_db, get_current_user, require_role
 from app.models.user import User
 from app.enums import UserRole
-from app.schemas.user import UserCreate, UserUpdate, UserOut, ProfileUpdate, ChangePasswordRequest
+from app.schemas.user import (
+    UserCreate, UserUpdate, UserOut, ProfileUpdate, ChangePasswordRequest,
+    BulkUserCreate, BulkUserResult,
+)
+from app.services import user_service
 from app.services.auth_service import hash_password, verify_password
 from app.utils.password import validate_password
+from app.utils.pagination import paginate, set_next_cursor
+from app.utils.principal_cache import principal_cache
 
 router = APIRouter()
 
@@ -28,6 +34,7 @@ def update_my_profile(
     for field, value in update_data.items():
         setattr(current_user, field, value)
     db.commit()
+    principal_cache.invalidate(current_user.id)
     db.refresh(current_user)
     return current_user
 
@@ -43,6 +50,7 @@ def change_my_password(
     validate_password(data.new_password)
     current_user.hashed_password = hash_password(data.new_password)
     db.commit()
+    principal_cache.invalidate(current_user.id)
     return {"message": "Password changed successfully"}
 
 
@@ -72,14 +80,37 @@ def create_internal_user(
     return user
 
 
+@router.post("/bulk", response_model=BulkUserResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_users(
+    data: BulkUserCreate,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+):
+    return user_service.bulk_create_users(db, data.users, data.sync_firebase)
+
+
+@router.post("/bulk/csv", response_model=BulkUserResult, status_code=status.HTTP_201_CREATED)
+def bulk_create_users_csv(
+    file: UploadFile = File(...),
+    sync_firebase: bool = False,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(require_role(UserRole.ADMIN)),
+):
+    items = user_service.parse_users_csv(file.file.read())
+    return user_service.bulk_create_users(db, items, sync_firebase)
+
+
 @router.get("/", response_model=list[UserOut])
 def list_users(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
+    cursor: str | None = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(require_role(UserRole.ADMIN, UserRole.INTERNAL)),
 ):
-    users = db.query(User).offset(skip).limit(limit).all()
+    users = paginate(db.query(User), User, skip, limit, cursor)
+    set_next_cursor(response, users, limit)
     return users
 
 
@@ -113,6 +144,7 @@ def update_user(
     for field, value in update_data.items():
         setattr(user, field, value)
     db.commit()
+    principal_cache.invalidate(user.id)
     db.refresh(user)
     return user
 
@@ -128,4 +160,5 @@ def delete_user(
         raise HTTPException(status_code=404, detail="User not found")
     user.is_active = False
     db.commit()
+    principal_cache.invalidate(user.id)
     return {"message": "User deactivated"}
@@ -0,0 +1,33 @@
+from pydantic import BaseModel, field_validator
+from datetime import datetime
+
+
+class ApiKeyCreate(BaseModel):
+    name: str
+    user_id: int
+    scopes: list[str] = []
+    expires_at: datetime | None = None
+
+
+class ApiKeyOut(BaseModel):
+    id: int
+    key_id: str
+    name: str
+    user_id: int
+    scopes: list[str]
+    is_active: bool
+    expires_at: datetime | None = None
+    revoked_at: datetime | None = None
+    created_at: datetime
+
+    @field_validator("scopes", mode="before")
+    @classmethod
+    def split_scopes(cls, value):
+        return value.split() if isinstance(value, str) else value
+
+    class Config:
+        from_attributes = True
+
+
+class ApiKeyCreated(ApiKeyOut):
+    api_key: str
@@ -0,0 +1,45 @@
+from pydantic import BaseModel
+from decimal import Decimal
+from datetime import date, datetime
+
+
+class BillingRunRequest(BaseModel):
+    run_date: date | None = None
+    chunk_size: int = 500
+
+
+class BillingRunSummary(BaseModel):
+    run_date: date
+    subscriptions_due: int
+    invoices_created: int
+    chunks_committed: int
+    chunks_failed: int
+    failed_subscription_ids: list[int] = []
+    total_amount: Decimal
+    duration_ms: int
+
+
+class BillingRunPartitionOut(BaseModel):
+    partition_no: int
+    status: str
+    worker_id: str | None = None
+    heartbeat_at: datetime | None = None
+    last_subscription_id: int
+    invoices_created: int
+    total_amount: Decimal
+
+    class Config:
+        from_attributes = True
+
+
+class BillingRunOut(BaseModel):
+    id: int
+    run_date: date
+    status: str
+    partition_count: int
+    chunk_size: int
+    finished_at: datetime | None = None
+    partitions: list[BillingRunPartitionOut] = []
+
+    class Config:
+        from_attributes = True
@@ -61,8 +61,25 @@ class ProductOut(BaseModel):
     shipping_info: str | None = None
     category: str | None = None
     image_url: str | None = None
+    image_variants: dict[str, str] = {}
     is_active: bool
     variants: list[VariantOut] = []
 
     class Config:
         from_attributes = True
+
+
+class FacetCount(BaseModel):
+    value: str
+    count: int
+
+
+class ProductFacets(BaseModel):
+    category: list[FacetCount] = []
+    product_type: list[FacetCount] = []
+
+
+class ProductSearchOut(BaseModel):
+    total: int
+    items: list[ProductOut]
+    facets: ProductFacets
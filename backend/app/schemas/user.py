@@ -49,3 +49,28 @@ class ProfileUpdate(BaseModel):
 class ChangePasswordRequest(BaseModel):
     old_password: str
     new_password: str
+
+
+class BulkUserItem(BaseModel):
+    email: EmailStr
+    full_name: str
+    password: str | None = None
+    phone: str | None = None
+    company: str | None = None
+    role: str = "portal"
+
+
+class BulkUserCreate(BaseModel):
+    users: list[BulkUserItem]
+    sync_firebase: bool = False
+
+
+class BulkUserSkipped(BaseModel):
+    email: str
+    reason: str
+
+
+class BulkUserResult(BaseModel):
+    created: int
+    skipped: list[BulkUserSkipped]
+    firebase_queued: int = 0
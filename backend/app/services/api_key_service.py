@@ -0,0 +1,209 @@
+import hashlib
+import hmac
+import logging
+import secrets
+import select
+import threading
+import time
+from datetime import datetime, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal, engine
+from app.models.api_key import ApiKey
+from app.models.user import User
+from app.schemas.api_key import ApiKeyCreate
+
+logger = logging.getLogger(__name__)
+
+API_KEY_PREFIX = "stk_"
+NOTIFY_CHANNEL = "api_keys"
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def _hash_secret(secret: str) -> str:
+    return hmac.new(settings.SECRET_KEY.encode(), secret.encode(), hashlib.sha256).hexdigest()
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class ApiKeyTable:
+    """In-memory table of active API keys, keyed by their public key id.
+
+    Verifying a key is a dict lookup plus one HMAC, with no DB round-trip. The
+    table is loaded at startup and kept current by a background thread. On
+    Postgres it LISTENs, on its own connection outside the pool, for the
+    NOTIFY sent on every create/revoke and reloads when one arrives (plus a
+    safety reload every API_KEY_LISTEN_RELOAD_SECONDS). Other databases are
+    reloaded every API_KEY_SYNC_SECONDS.
+    """
+
+    def __init__(self, sync_seconds: float, listen_reload_seconds: float):
+        self.sync_seconds = sync_seconds
+        self.listen_reload_seconds = listen_reload_seconds
+        self._entries: dict[str, tuple[str, int, frozenset[str], float | None]] = {}
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+
+    def load(self):
+        db = SessionLocal()
+        try:
+            keys = db.query(ApiKey).filter(ApiKey.is_active == True).all()  # noqa: E712
+            # One assignment, so readers never see a half-built table
+            self._entries = {key.key_id: self._entry(key) for key in keys}
+        finally:
+            db.close()
+
+    @staticmethod
+    def _entry(key: ApiKey) -> tuple[str, int, frozenset[str], float | None]:
+        return key.key_hash, key.user_id, frozenset(key.scopes.split()), _timestamp(key.expires_at)
+
+    def upsert(self, key: ApiKey):
+        entries = dict(self._entries)
+        if key.is_active:
+            entries[key.key_id] = self._entry(key)
+        else:
+            entries.pop(key.key_id, None)
+        self._entries = entries
+
+    def verify(self, token: str) -> tuple[int, frozenset[str]] | None:
+        """Return (user id, scopes) for a valid, unexpired key, else None."""
+        try:
+            key_id, secret = token[len(API_KEY_PREFIX):].split("_", 1)
+        except ValueError:
+            return None
+        entry = self._entries.get(key_id)
+        if entry is None:
+            return None
+        key_hash, user_id, scopes, expires_at = entry
+        if not hmac.compare_digest(key_hash, _hash_secret(secret)):
+            return None
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return user_id, scopes
+
+    def start_sync(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stopping.clear()
+        target = self._listen if engine.dialect.name == "postgresql" else self._poll
+        self._thread = threading.Thread(target=target, name="api-key-sync", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping.set()
+
+    def _reload(self):
+        try:
+            self.load()
+        except Exception:
+            logger.warning("Reloading API keys failed", exc_info=True)
+
+    def _poll(self):
+        while not self._stopping.wait(self.sync_seconds):
+            self._reload()
+
+    def _listen(self):
+        while not self._stopping.is_set():
+            try:
+                # A dedicated connection, so the listener never holds a request pool slot
+                cargs, cparams = engine.dialect.create_connect_args(engine.url)
+                dbapi_conn = engine.dialect.connect(*cargs, **cparams)
+            except Exception:
+                logger.warning("API key listener could not connect", exc_info=True)
+                self._stopping.wait(self.sync_seconds)
+                continue
+            try:
+                dbapi_conn.autocommit = True
+                with dbapi_conn.cursor() as cursor:
+                    cursor.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                # Catch anything changed while we were not listening
+                self._reload()
+                next_reload = time.monotonic() + self.listen_reload_seconds
+                while not self._stopping.is_set():
+                    ready, _, _ = select.select([dbapi_conn], [], [], self.sync_seconds)
+                    notified = False
+                    if ready:
+                        dbapi_conn.poll()
+                        notified = bool(dbapi_conn.notifies)
+                        dbapi_conn.notifies.clear()
+                    if notified or time.monotonic() >= next_reload:
+                        self._reload()
+                        next_reload = time.monotonic() + self.listen_reload_seconds
+            except Exception:
+                logger.warning("API key listener failed; reconnecting", exc_info=True)
+                self._stopping.wait(1)
+            finally:
+                try:
+                    dbapi_conn.close()
+                except Exception:
+                    pass
+
+
+api_key_table = ApiKeyTable(settings.API_KEY_SYNC_SECONDS, settings.API_KEY_LISTEN_RELOAD_SECONDS)
+
+
+def _notify(db: Session, key: ApiKey):
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(text("SELECT pg_notify(:channel, :key_id)"), {"channel": NOTIFY_CHANNEL, "key_id": key.key_id})
+
+
+def create_api_key(db: Session, data: ApiKeyCreate) -> tuple[ApiKey, str]:
+    """Create a key and return it with its plaintext, which is never stored."""
+    if not db.query(User).filter(User.id == data.user_id).first():
+        raise HTTPException(status_code=404, detail="User not found")
+    key_id = secrets.token_hex(8)
+    secret = secrets.token_urlsafe(32)
+    key = ApiKey(
+        key_id=key_id,
+        key_hash=_hash_secret(secret),
+        name=data.name,
+        user_id=data.user_id,
+        scopes=" ".join(data.scopes),
+        expires_at=data.expires_at,
+    )
+    db.add(key)
+    db.flush()
+    _notify(db, key)
+    db.commit()
+    db.refresh(key)
+    api_key_table.upsert(key)
+    return key, f"{API_KEY_PREFIX}{key_id}_{secret}"
+
+
+def get_api_keys(db: Session, skip: int = 0, limit: int = 100) -> list[ApiKey]:
+    return db.query(ApiKey).order_by(ApiKey.id.desc()).offset(skip).limit(limit).all()
+
+
+def revoke_api_key(db: Session, api_key_id: int) -> ApiKey:
+    key = db.query(ApiKey).filter(ApiKey.id == api_key_id).first()
+    if not key:
+        raise HTTPException(status_code=404, detail="API key not found")
+    if key.is_active:
+        key.is_active = False
+        key.revoked_at = datetime.now(timezone.utc)
+        _notify(db, key)
+        db.commit()
+        db.refresh(key)
+    api_key_table.upsert(key)
+    return key
+
+
+def scope_allows(scopes: frozenset[str], method: str, path: str) -> bool:
+    """Scopes look like "invoices:read" or "invoices:write"; write implies read, "*" allows all."""
+    if "*" in scopes:
+        return True
+    parts = path.strip("/").split("/")
+    resource = parts[1] if len(parts) > 1 and parts[0] == "api" else parts[0]
+    if f"{resource}:write" in scopes:
+        return True
+    return method in READ_METHODS and f"{resource}:read" in scopes
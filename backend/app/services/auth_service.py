@@ -1,5 +1,11 @@
+import multiprocessing
+import os
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime, timedelta, timezone
 
+from fastapi import HTTPException, status
 from jose import jwt, JWTError
 from passlib.context import CryptContext
 
@@ -7,26 +13,129 @@ from app.config import settings
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+# bcrypt runs in worker processes; admission is capped at workers + queue so a
+# login burst gets fast 503s instead of tying up the request threadpool.
+_hash_pool: ProcessPoolExecutor | None = None
+_hash_pool_lock = threading.Lock()
+_hash_slots = threading.BoundedSemaphore(
+    max(settings.PASSWORD_HASH_WORKERS + settings.PASSWORD_HASH_QUEUE_LIMIT, 1)
+)
 
-def hash_password(password: str) -> str:
+
+def _init_hash_worker():
+    # Request handling wins the CPU when bcrypt and the API share cores
+    if hasattr(os, "nice"):
+        os.nice(10)
+
+
+def _get_hash_pool() -> ProcessPoolExecutor:
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is None:
+            _hash_pool = ProcessPoolExecutor(
+                max_workers=settings.PASSWORD_HASH_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_hash_worker,
+            )
+        return _hash_pool
+
+
+def shutdown_hash_pool():
+    global _hash_pool
+    with _hash_pool_lock:
+        if _hash_pool is not None:
+            _hash_pool.shutdown(wait=False, cancel_futures=True)
+            _hash_pool = None
+
+
+def _hashing_busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Authentication is busy, please retry shortly",
+        headers={"Retry-After": str(settings.PASSWORD_HASH_RETRY_AFTER)},
+    )
+
+
+def _run_hashing(fn, *args):
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return fn(*args)
+    if not _hash_slots.acquire(blocking=False):
+        raise _hashing_busy()
+    try:
+        return _get_hash_pool().submit(fn, *args).result()
+    except BrokenProcessPool:
+        shutdown_hash_pool()
+        raise _hashing_busy()
+    finally:
+        _hash_slots.release()
+
+
+def _hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
-def verify_password(plain: str, hashed: str) -> bool:
+def _verify(plain: str, hashed: str) -> bool:
     return pwd_context.verify(plain, hashed)
 
 
+def _hash_many(passwords: list[str]) -> list[str]:
+    return [pwd_context.hash(password) for password in passwords]
+
+
+def hash_password(password: str) -> str:
+    return _run_hashing(_hash, password)
+
+
+def verify_password(plain: str, hashed: str) -> bool:
+    return _run_hashing(_verify, plain, hashed)
+
+
+def hash_passwords(passwords: list[str], chunk_size: int = 16) -> list[str]:
+    """Hash many passwords on the worker pool for bulk imports.
+
+    Holds one admission slot and keeps at most one small chunk per worker in
+    flight, so logins queued behind an import wait for a chunk, not the import.
+    """
+    if not passwords:
+        return []
+    if settings.PASSWORD_HASH_WORKERS <= 0:
+        return _hash_many(passwords)
+    if not _hash_slots.acquire(blocking=False):
+        raise _hashing_busy()
+    try:
+        pool = _get_hash_pool()
+        chunks = [passwords[i:i + chunk_size] for i in range(0, len(passwords), chunk_size)]
+        results: list[list[str] | None] = [None] * len(chunks)
+        in_flight = {}
+        for index, chunk in enumerate(chunks):
+            if len(in_flight) >= settings.PASSWORD_HASH_WORKERS:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results[in_flight.pop(future)] = future.result()
+            in_flight[pool.submit(_hash_many, chunk)] = index
+        for future, index in in_flight.items():
+            results[index] = future.result()
+        return [hashed for chunk in results for hashed in chunk]
+    except BrokenProcessPool:
+        shutdown_hash_pool()
+        raise _hashing_busy()
+    finally:
+        _hash_slots.release()
+
+
 def create_access_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-    to_encode.update({"exp": expire, "type": "access"})
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    to_encode.update({"exp": expire, "iat": now, "type": "access"})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
 def create_refresh_token(data: dict) -> str:
     to_encode = data.copy()
-    expire = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
-    to_encode.update({"exp": expire, "type": "refresh"})
+    now = datetime.now(timezone.utc)
+    expire = now + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
+    to_encode.update({"exp": expire, "iat": now, "type": "refresh"})
     return jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
 
 
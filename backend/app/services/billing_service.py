@@ -0,0 +1,436 @@
+import logging
+import threading
+import time
+from collections import Counter
+from decimal import Decimal
+from datetime import date, datetime, timedelta, timezone
+
+from fastapi import HTTPException
+from sqlalchemy import and_, func, insert, or_, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload, selectinload
+
+from app.models.invoice import Invoice, InvoiceLine
+from app.models.subscription import Subscription
+from app.models.tax import Tax
+from app.models.discount import Discount
+from app.models.billing_run import BillingRun, BillingRunPartition
+from app.enums import BillingRunStatus, InvoiceStatus, SubscriptionStatus
+from app.services.invoice_service import (
+    PAYMENT_TERM_DAYS, compute_line_amounts, next_billing_date,
+)
+from app.utils.sequence import generate_sequence_block
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE = 500
+PARTITION_LEASE = timedelta(minutes=5)
+HEARTBEAT_INTERVAL = PARTITION_LEASE / 5
+
+
+def _due_filter(run_date: date):
+    return (
+        Subscription.status == SubscriptionStatus.ACTIVE,
+        Subscription.next_invoice_date != None,
+        Subscription.next_invoice_date <= run_date,
+    )
+
+
+def get_due_subscription_ids(db: Session, run_date: date) -> list[int]:
+    rows = db.query(Subscription.id).filter(*_due_filter(run_date)).order_by(Subscription.id).all()
+    return [row.id for row in rows]
+
+
+def _load_reference_rows(db: Session, model_class) -> dict:
+    """Load a small lookup table once and detach it so chunk commits don't expire it."""
+    rows = db.query(model_class).all()
+    for row in rows:
+        db.expunge(row)
+    return {row.id: row for row in rows}
+
+
+def _lock_due_subscriptions(db: Session, sub_ids, run_date: date, skip_locked: bool) -> list[Subscription]:
+    return (
+        db.query(Subscription)
+        .options(joinedload(Subscription.plan), selectinload(Subscription.lines))
+        .filter(Subscription.id.in_(sub_ids), *_due_filter(run_date))
+        .order_by(Subscription.id)
+        .with_for_update(of=Subscription, skip_locked=skip_locked)
+        .all()
+    )
+
+
+def _bill_chunk(db: Session, sub_ids: list[int], run_date: date,
+                taxes: dict, discounts: dict) -> tuple[list[int], Decimal]:
+    """Invoice one chunk of subscriptions with bulk statements; returns the billed ids.
+
+    Rows locked by another transaction are first skipped, then waited for, so
+    every subscription of the chunk that is still due is billed before the
+    caller commits. Caller owns the transaction.
+    """
+    subs = _lock_due_subscriptions(db, sub_ids, run_date, skip_locked=True)
+    locked = set(sub_ids) - {sub.id for sub in subs}
+    if locked:
+        subs = sorted(subs + _lock_due_subscriptions(db, locked, run_date, skip_locked=False),
+                      key=lambda sub: sub.id)
+    if not subs:
+        return [], Decimal("0")
+
+    numbers = generate_sequence_block(db, Invoice, "INV", "invoice_number", len(subs))
+    due_date = run_date + timedelta(days=PAYMENT_TERM_DAYS)
+
+    invoice_rows = []
+    line_groups = []
+    sub_updates = []
+    discount_usage = Counter()
+    chunk_total = Decimal("0")
+
+    for sub, invoice_number in zip(subs, numbers):
+        subtotal = Decimal("0")
+        tax_total = Decimal("0")
+        discount_total = Decimal("0")
+        lines = []
+
+        for sl in sub.lines:
+            amounts = compute_line_amounts(sl, discounts.get(sl.discount_id), taxes.get(sl.tax_id))
+            if amounts["discount_applied"]:
+                discount_usage[sl.discount_id] += 1
+            lines.append({
+                "product_id": sl.product_id,
+                "description": None,
+                "quantity": sl.quantity,
+                "unit_price": sl.unit_price,
+                "tax_id": sl.tax_id,
+                "tax_amount": amounts["tax_amount"],
+                "discount_amount": amounts["discount_amount"],
+                "line_total": amounts["line_total"],
+            })
+            subtotal += amounts["subtotal"]
+            tax_total += amounts["tax_amount"]
+            discount_total += amounts["discount_amount"]
+
+        total = subtotal - discount_total + tax_total
+        chunk_total += total
+        invoice_rows.append({
+            "invoice_number": invoice_number,
+            "subscription_id": sub.id,
+            "customer_id": sub.customer_id,
+            "issue_date": run_date,
+            "due_date": due_date,
+            "status": InvoiceStatus.DRAFT,
+            "subtotal": subtotal,
+            "tax_total": tax_total,
+            "discount_total": discount_total,
+            "total": total,
+        })
+        line_groups.append(lines)
+        sub_updates.append({
+            "id": sub.id,
+            "next_invoice_date": next_billing_date(sub.next_invoice_date, sub.plan.billing_period),
+        })
+
+    invoice_ids = db.execute(
+        insert(Invoice).returning(Invoice.id, sort_by_parameter_order=True),
+        invoice_rows,
+    ).scalars().all()
+
+    line_rows = [
+        {**line, "invoice_id": invoice_id}
+        for invoice_id, lines in zip(invoice_ids, line_groups)
+        for line in lines
+    ]
+    if line_rows:
+        db.execute(insert(InvoiceLine), line_rows)
+
+    db.execute(update(Subscription), sub_updates)
+
+    for discount_id, count in discount_usage.items():
+        db.execute(
+            update(Discount)
+            .where(Discount.id == discount_id)
+            .values(usage_count=func.coalesce(Discount.usage_count, 0) + count)
+        )
+
+    return [sub.id for sub in subs], chunk_total
+
+
+def run_billing(db: Session, run_date: date | None = None,
+                chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """Invoice every ACTIVE subscription due on or before run_date, one transaction per chunk."""
+    started = time.monotonic()
+    run_date = run_date or date.today()
+    chunk_size = max(1, chunk_size)
+
+    sub_ids = get_due_subscription_ids(db, run_date)
+    taxes = _load_reference_rows(db, Tax)
+    discounts = _load_reference_rows(db, Discount)
+    db.commit()
+
+    invoices_created = 0
+    chunks_committed = 0
+    chunks_failed = 0
+    failed_ids = []
+    total_amount = Decimal("0")
+
+    for offset in range(0, len(sub_ids), chunk_size):
+        chunk = sub_ids[offset:offset + chunk_size]
+        try:
+            billed, amount = _bill_chunk(db, chunk, run_date, taxes, discounts)
+            db.commit()
+        except Exception:
+            # Bad data (e.g. a line amount that fails to compute) must not abort the whole run
+            db.rollback()
+            logger.exception("Billing run %s: chunk starting at subscription #%s failed",
+                             run_date, chunk[0])
+            chunks_failed += 1
+            failed_ids.extend(chunk)
+            continue
+        invoices_created += len(billed)
+        total_amount += amount
+        chunks_committed += 1
+
+    return {
+        "run_date": run_date,
+        "subscriptions_due": len(sub_ids),
+        "invoices_created": invoices_created,
+        "chunks_committed": chunks_committed,
+        "chunks_failed": chunks_failed,
+        "failed_subscription_ids": failed_ids,
+        "total_amount": total_amount.quantize(Decimal("0.01")),
+        "duration_ms": int((time.monotonic() - started) * 1000),
+    }
+
+
+def get_or_create_run(db: Session, run_date: date, partition_count: int = 1,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> BillingRun:
+    """Return the run for run_date, creating it with its partitions if this caller gets there first.
+
+    The unique run_date acts as the leader election: exactly one worker's INSERT wins and
+    the partition layout it chose is the one every other worker follows.
+    """
+    run = db.query(BillingRun).filter(BillingRun.run_date == run_date).first()
+    if run:
+        return run
+
+    run = BillingRun(
+        run_date=run_date,
+        status=BillingRunStatus.RUNNING,
+        partition_count=max(1, partition_count),
+        chunk_size=max(1, chunk_size),
+    )
+    run.partitions = [
+        BillingRunPartition(partition_no=n, status=BillingRunStatus.PENDING)
+        for n in range(run.partition_count)
+    ]
+    db.add(run)
+    try:
+        db.commit()
+    except IntegrityError:
+        db.rollback()
+        run = db.query(BillingRun).filter(BillingRun.run_date == run_date).one()
+    return run
+
+
+def _claim_partition(db: Session, run: BillingRun, worker_id: str) -> BillingRunPartition | None:
+    """Claim a pending partition, or one whose worker stopped heartbeating."""
+    now = datetime.now(timezone.utc)
+    partition = (
+        db.query(BillingRunPartition)
+        .filter(
+            BillingRunPartition.run_id == run.id,
+            or_(
+                BillingRunPartition.status == BillingRunStatus.PENDING,
+                and_(
+                    BillingRunPartition.status == BillingRunStatus.RUNNING,
+                    BillingRunPartition.heartbeat_at < now - PARTITION_LEASE,
+                ),
+            ),
+        )
+        .order_by(BillingRunPartition.partition_no)
+        .with_for_update(skip_locked=True)
+        .first()
+    )
+    if partition:
+        partition.status = BillingRunStatus.RUNNING
+        partition.worker_id = worker_id
+        partition.heartbeat_at = now
+    db.commit()
+    return partition
+
+
+class _PartitionHeartbeat:
+    """Keeps a claimed partition's lease alive from a background thread.
+
+    Beats on its own connection every HEARTBEAT_INTERVAL, however long a chunk
+    takes, and sets `lost` once the row no longer belongs to this worker.
+    """
+
+    def __init__(self, engine, partition_id: int, worker_id: str):
+        self.engine = engine
+        self.partition_id = partition_id
+        self.worker_id = worker_id
+        self.lost = threading.Event()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name=f"billing-heartbeat-{partition_id}", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self):
+        table = BillingRunPartition.__table__
+        while not self._stop.wait(HEARTBEAT_INTERVAL.total_seconds()):
+            try:
+                with self.engine.begin() as conn:
+                    matched = conn.execute(
+                        update(table)
+                        .where(table.c.id == self.partition_id, table.c.worker_id == self.worker_id,
+                               table.c.status == BillingRunStatus.RUNNING)
+                        .values(heartbeat_at=datetime.now(timezone.utc))
+                    ).rowcount
+            except SQLAlchemyError:
+                # A slow chunk may hold the lock; the next beat is well inside the lease
+                logger.warning("Heartbeat for billing partition #%s failed", self.partition_id, exc_info=True)
+                continue
+            if matched == 0:
+                self.lost.set()
+                return
+
+
+def _fenced_partition_update(db: Session, partition: BillingRunPartition, worker_id: str, **values) -> bool:
+    """Update the partition only while this worker still holds its lease."""
+    result = db.execute(
+        update(BillingRunPartition)
+        .where(
+            BillingRunPartition.id == partition.id,
+            BillingRunPartition.worker_id == worker_id,
+            BillingRunPartition.status == BillingRunStatus.RUNNING,
+        )
+        .values(**values)
+        .execution_options(synchronize_session="fetch")
+    )
+    return result.rowcount == 1
+
+
+def _bill_partition(db: Session, run: BillingRun, partition: BillingRunPartition,
+                    worker_id: str, taxes: dict, discounts: dict) -> bool:
+    """Bill a partition from its checkpoint onwards. Returns False if a chunk failed or the lease was lost."""
+    with _PartitionHeartbeat(db.get_bind(), partition.id, worker_id) as heartbeat:
+        while not heartbeat.lost.is_set():
+            rows = (
+                db.query(Subscription.id)
+                .filter(
+                    *_due_filter(run.run_date),
+                    Subscription.id > partition.last_subscription_id,
+                    Subscription.id % run.partition_count == partition.partition_no,
+                )
+                .order_by(Subscription.id)
+                .limit(run.chunk_size)
+                .all()
+            )
+            if not rows:
+                break
+            chunk = [row.id for row in rows]
+            try:
+                billed, amount = _bill_chunk(db, chunk, run.run_date, taxes, discounts)
+                # The checkpoint commits with the invoices, so a crash can never re-bill a chunk;
+                # every id up to chunk[-1] is billed or no longer due at this point. It is fenced
+                # on worker_id, so a worker whose lease was taken over rolls its chunk back.
+                if not _fenced_partition_update(
+                    db, partition, worker_id,
+                    last_subscription_id=chunk[-1],
+                    invoices_created=BillingRunPartition.invoices_created + len(billed),
+                    total_amount=BillingRunPartition.total_amount + amount,
+                    heartbeat_at=datetime.now(timezone.utc),
+                ):
+                    db.rollback()
+                    heartbeat.lost.set()
+                    break
+                db.commit()
+            except Exception:
+                db.rollback()
+                logger.exception("Billing run %s: partition %s failed after subscription #%s",
+                                 run.run_date, partition.partition_no, partition.last_subscription_id)
+                return False
+
+    if heartbeat.lost.is_set():
+        logger.warning("Billing run %s: partition %s was taken over by another worker; stopping",
+                       run.run_date, partition.partition_no)
+        return False
+
+    if not _fenced_partition_update(db, partition, worker_id, status=BillingRunStatus.COMPLETED):
+        db.rollback()
+        logger.warning("Billing run %s: partition %s was taken over by another worker; stopping",
+                       run.run_date, partition.partition_no)
+        return False
+    remaining = db.query(func.count(BillingRunPartition.id)).filter(
+        BillingRunPartition.run_id == run.id,
+        BillingRunPartition.status != BillingRunStatus.COMPLETED,
+    ).scalar()
+    if remaining == 0:
+        run.status = BillingRunStatus.COMPLETED
+        run.finished_at = datetime.now(timezone.utc)
+    db.commit()
+    return True
+
+
+def run_billing_worker(db: Session, worker_id: str, run_date: date | None = None,
+                       partition_count: int = 1, chunk_size: int = DEFAULT_CHUNK_SIZE) -> dict:
+    """Join the billing run for run_date and work through partitions until none are left.
+
+    Any number of workers may call this concurrently; re-running after a crash resumes
+    each unfinished partition from its last committed checkpoint.
+    """
+    started = time.monotonic()
+    run = get_or_create_run(db, run_date or date.today(), partition_count, chunk_size)
+    taxes = _load_reference_rows(db, Tax)
+    discounts = _load_reference_rows(db, Discount)
+    db.commit()
+
+    completed = []
+    failed = []
+    invoices_created = 0
+    total_amount = Decimal("0")
+
+    while True:
+        partition = _claim_partition(db, run, worker_id)
+        if partition is None:
+            break
+        invoices_before = partition.invoices_created
+        amount_before = partition.total_amount
+        ok = _bill_partition(db, run, partition, worker_id, taxes, discounts)
+        db.refresh(partition)
+        invoices_created += partition.invoices_created - invoices_before
+        total_amount += partition.total_amount - amount_before
+        if not ok:
+            failed.append(partition.partition_no)
+            break
+        completed.append(partition.partition_no)
+
+    db.refresh(run)
+    return {
+        "run_id": run.id,
+        "run_date": run.run_date,
+        "run_status": run.status.value,
+        "worker_id": worker_id,
+        "partitions_completed": completed,
+        "partitions_failed": failed,
+        "invoices_created": invoices_created,
+        "total_amount": Decimal(total_amount).quantize(Decimal("0.01")),
+        "duration_ms": int((time.monotonic() - started) * 1000),
+    }
+
+
+def get_runs(db: Session, skip: int = 0, limit: int = 100) -> list[BillingRun]:
+    return db.query(BillingRun).order_by(BillingRun.run_date.desc()).offset(skip).limit(limit).all()
+
+
+def get_run(db: Session, run_id: int) -> BillingRun:
+    run = db.query(BillingRun).filter(BillingRun.id == run_id).first()
+    if not run:
+        raise HTTPException(status_code=404, detail="Billing run not found")
+    return run
@@ -1,10 +1,10 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.cart import Cart, CartItem
-from app.models.product import Product, ProductVariant
-from app.models.recurring_plan import RecurringPlan
+from app.models.product import Product
 from app.schemas.cart import CartItemAdd, CartItemUpdate
+from app.utils.loading import eager
 
 
 def get_or_create_cart(db: Session, user_id: int) -> Cart:
@@ -19,11 +19,14 @@ def get_or_create_cart(db: Session, user_id: int) -> Cart:
 
 def get_cart_with_details(db: Session, user_id: int) -> dict:
     cart = get_or_create_cart(db, user_id)
+    cart_items = db.query(CartItem).options(*eager(
+        selectinload(CartItem.product),
+        selectinload(CartItem.variant),
+        selectinload(CartItem.plan),
+    )).filter(CartItem.cart_id == cart.id).order_by(CartItem.id).all()
     items = []
-    for item in cart.items:
-        product = db.query(Product).filter(Product.id == item.product_id).first()
-        variant = db.query(ProductVariant).filter(ProductVariant.id == item.variant_id).first() if item.variant_id else None
-        plan = db.query(RecurringPlan).filter(RecurringPlan.id == item.plan_id).first() if item.plan_id else None
+    for item in cart_items:
+        product, variant, plan = item.product, item.variant, item.plan
         items.append({
             "id": item.id,
             "product_id": item.product_id,
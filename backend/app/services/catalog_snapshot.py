@@ -0,0 +1,130 @@
+import bisect
+import gzip
+import threading
+
+from fastapi import Request, Response
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.product import Product, ProductVariant
+from app.schemas.product import ProductOut
+from app.utils.conditional import GZIP_ETAG_SUFFIX, copy_response_headers, table_versions
+from app.utils.pagination import NEXT_CURSOR_HEADER, decode_cursor, encode_cursor
+
+CATALOG_TABLES = (Product.__table__, ProductVariant.__table__)
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip, honouring q-values (gzip;q=0 refuses it)."""
+    qualities = {}
+    for part in accept_encoding.lower().split(","):
+        coding, *params = (item.strip() for item in part.split(";"))
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding] = quality
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
+
+
+class CatalogSlice:
+    """Products of one slice in id order, each pre-encoded, plus the whole slice as JSON and gzip."""
+
+    def __init__(self, entries: list[tuple[int, str | None, str, bytes]]):
+        self.entries = entries
+        self.ids = [entry[0] for entry in entries]
+        self.body = b"[" + b",".join(entry[3] for entry in entries) + b"]"
+        self.gzip_body = gzip.compress(self.body, compresslevel=9)
+
+
+class CatalogSnapshot:
+    """The active public catalog rendered once into JSON bytes.
+
+    Holds the full catalog and one slice per product type and per category,
+    each with a precompressed gzip body. Snapshots are tied to the
+    products/product_variants table versions, so any committed product or
+    variant change (from this worker at once, from others within
+    CATALOG_VERSION_TTL_SECONDS) triggers a rebuild on the next read.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._slices: dict[str, CatalogSlice] = {}
+
+    def invalidate(self):
+        self._version = None
+
+    def _build(self, db: Session) -> dict[str, CatalogSlice]:
+        products = db.query(Product).options(selectinload(Product.variants)).filter(
+            Product.is_active == True  # noqa: E712
+        ).order_by(Product.id).all()
+        entries = [
+            (p.id, p.category, p.product_type.value, ProductOut.model_validate(p).model_dump_json().encode())
+            for p in products
+        ]
+        slices = {"all": CatalogSlice(entries)}
+        for key in {f"type:{e[2]}" for e in entries} | {f"category:{e[1]}" for e in entries if e[1]}:
+            kind, value = key.split(":", 1)
+            index = 2 if kind == "type" else 1
+            slices[key] = CatalogSlice([e for e in entries if e[index] == value])
+        return slices
+
+    def slices(self, db: Session) -> dict[str, CatalogSlice]:
+        version = table_versions.get(db, CATALOG_TABLES)
+        if self._version == version:
+            return self._slices
+        with self._lock:
+            if self._version != version:
+                self._slices = self._build(db)
+                self._version = version
+            return self._slices
+
+    def response(self, db: Session, request: Request, response: Response,
+                 product_type: str | None = None, category: str | None = None,
+                 skip: int = 0, limit: int = 100, cursor: str | None = None) -> Response:
+        """Serve one page of the catalog from the snapshot, with the same ordering and cursor as the DB path."""
+        slices = self.slices(db)
+        if product_type and category:
+            base = slices.get(f"type:{product_type}")
+            catalog = CatalogSlice([e for e in base.entries if e[1] == category]) if base else None
+        elif product_type:
+            catalog = slices.get(f"type:{product_type}")
+        elif category:
+            catalog = slices.get(f"category:{category}")
+        else:
+            catalog = slices["all"]
+        catalog = catalog or CatalogSlice([])
+
+        if cursor:
+            start = bisect.bisect_right(catalog.ids, decode_cursor(cursor))
+        else:
+            start = max(skip, 0)
+        page = catalog.entries[start:start + max(limit, 0)]
+
+        if len(page) == len(catalog.entries):
+            if accepts_gzip(request.headers.get("accept-encoding", "")):
+                result = Response(catalog.gzip_body, media_type="application/json",
+                                  headers={"Content-Encoding": "gzip"})
+            else:
+                result = Response(catalog.body, media_type="application/json")
+            result.headers["Vary"] = "Accept-Encoding"
+        else:
+            result = Response(b"[" + b",".join(entry[3] for entry in page) + b"]", media_type="application/json")
+        copy_response_headers(response, result)
+        if result.headers.get("content-encoding") == "gzip" and "etag" in result.headers:
+            result.headers["etag"] = result.headers["etag"][:-1] + f'{GZIP_ETAG_SUFFIX}"'
+        if page and len(page) >= limit:
+            result.headers[NEXT_CURSOR_HEADER] = encode_cursor(page[-1][0])
+        return result
+
+
+catalog_snapshot = CatalogSnapshot()
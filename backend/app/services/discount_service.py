@@ -4,6 +4,7 @@ from sqlalchemy.orm import Session
 from app.models.discount import Discount
 from app.models.product import Product
 from app.schemas.discount import DiscountCreate, DiscountUpdate
+from app.utils.pagination import paginate
 
 
 def create_discount(db: Session, data: DiscountCreate) -> Discount:
@@ -26,8 +27,10 @@ def create_discount(db: Session, data: DiscountCreate) -> Discount:
     return discount
 
 
-def get_discounts(db: Session, skip: int = 0, limit: int = 100) -> list[Discount]:
-    return db.query(Discount).filter(Discount.is_active == True).offset(skip).limit(limit).all()
+def get_discounts(db: Session, skip: int = 0, limit: int = 100,
+                  cursor: str | None = None) -> list[Discount]:
+    query = db.query(Discount).filter(Discount.is_active == True)
+    return paginate(query, Discount, skip, limit, cursor)
 
 
 def get_discount(db: Session, discount_id: int) -> Discount:
@@ -0,0 +1,200 @@
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from functools import lru_cache
+
+import requests
+from jose import jwk, jwt, JWTError
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+REFRESH_MARGIN_SECONDS = 300
+RETRY_SECONDS = 60
+DEFAULT_MAX_AGE_SECONDS = 3600
+
+
+class SigningKeyCache:
+    """Google's Firebase ID-token signing certificates, kept in memory and optionally on disk.
+
+    A background thread refreshes them shortly before the Cache-Control max-age
+    runs out, so verifying a token never waits on the network. With a keys file
+    configured (air-gapped tests) the file is the only source. The disk cache is
+    only used when a cache path is configured, and only trusted when this
+    process user owns it and nobody else can write to it.
+    """
+
+    def __init__(self, url: str, cache_path: str, keys_file: str = ""):
+        self.url = url
+        self.cache_path = cache_path
+        self.keys_file = keys_file
+        self._lock = threading.Lock()
+        self._keys: dict[str, object] = {}
+        self._expires_at = 0.0
+        self._fetched_at = 0.0
+        self._wake = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._stopping = False
+
+    def _install(self, certs: dict[str, str], expires_at: float):
+        keys = {kid: jwk.construct(pem, "RS256") for kid, pem in certs.items()}
+        with self._lock:
+            self._keys = keys
+            self._expires_at = expires_at
+
+    def _load_file(self, path: str, cached: bool) -> bool:
+        """Load the disk cache ({"expires_at", "keys"}) or a raw Google keys document."""
+        try:
+            if cached:
+                fd = os.open(path, os.O_RDONLY | getattr(os, "O_NOFOLLOW", 0))
+                st = os.fstat(fd)
+                if st.st_uid != os.getuid() or st.st_mode & 0o022:
+                    os.close(fd)
+                    logger.warning("Ignoring Firebase signing keys cache %s: not owned by us or writable by others", path)
+                    return False
+                f = os.fdopen(fd)
+            else:
+                f = open(path)
+            with f:
+                data = json.load(f)
+            if cached:
+                self._install(data["keys"], data["expires_at"])
+            else:
+                self._install(data, float("inf"))
+        except (OSError, ValueError, KeyError, TypeError):
+            return False
+        return True
+
+    def refresh(self):
+        resp = requests.get(
+            self.url,
+            timeout=(settings.FIREBASE_HTTP_CONNECT_TIMEOUT, settings.FIREBASE_HTTP_READ_TIMEOUT),
+        )
+        resp.raise_for_status()
+        certs = resp.json()
+        match = re.search(r"max-age=(\d+)", resp.headers.get("Cache-Control", ""))
+        expires_at = time.time() + (int(match.group(1)) if match else DEFAULT_MAX_AGE_SECONDS)
+        self._install(certs, expires_at)
+        self._fetched_at = time.time()
+        if self.cache_path:
+            self._write_cache(certs, expires_at)
+
+    def _write_cache(self, certs: dict[str, str], expires_at: float):
+        # mkstemp gives a private (0600) file with a unique name, so workers do not
+        # race on one tmp file and a planted symlink is never followed
+        tmp_path = None
+        try:
+            fd, tmp_path = tempfile.mkstemp(
+                dir=os.path.dirname(os.path.abspath(self.cache_path)),
+                prefix=".firebase-certs-", suffix=".tmp",
+            )
+            with os.fdopen(fd, "w") as f:
+                json.dump({"expires_at": expires_at, "keys": certs}, f)
+            os.replace(tmp_path, self.cache_path)
+        except OSError:
+            logger.warning("Could not write Firebase signing keys cache %s", self.cache_path, exc_info=True)
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def load(self):
+        """Fill the cache from the keys file, else the disk cache, else the network."""
+        if self.keys_file:
+            if not self._load_file(self.keys_file, cached=False):
+                raise RuntimeError(f"Cannot read Firebase keys file {self.keys_file}")
+            return
+        if self.cache_path and self._load_file(self.cache_path, cached=True) and self._expires_at > time.time():
+            return
+        try:
+            self.refresh()
+        except Exception:
+            if not self._keys:
+                raise
+            logger.warning("Firebase signing keys expired and refresh failed; using stale keys", exc_info=True)
+
+    def get(self, kid: str | None):
+        if not self._keys:
+            self.load()
+        key = self._keys.get(kid)
+        if key is None and not self.keys_file:
+            # Google may have rotated early; let the refresher pick it up
+            self._wake.set()
+        return key
+
+    def start_background_refresh(self):
+        if self.keys_file or (self._thread is not None and self._thread.is_alive()):
+            return
+        self._stopping = False
+        self._thread = threading.Thread(target=self._run, name="firebase-signing-keys", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stopping = True
+        self._wake.set()
+
+    def _run(self):
+        delay = 0.0
+        while True:
+            woken = self._wake.wait(delay)
+            self._wake.clear()
+            if self._stopping:
+                return
+            since_fetch = time.time() - self._fetched_at
+            if woken and self._keys and since_fetch < RETRY_SECONDS:
+                # Unknown-kid nudges must not turn into a refresh per request
+                delay = RETRY_SECONDS - since_fetch
+                continue
+            try:
+                if self._keys:
+                    self.refresh()
+                else:
+                    self.load()
+                delay = max(self._expires_at - time.time() - REFRESH_MARGIN_SECONDS, RETRY_SECONDS)
+            except Exception:
+                logger.warning("Refreshing Firebase signing keys failed", exc_info=True)
+                delay = RETRY_SECONDS
+
+
+signing_keys = SigningKeyCache(
+    settings.FIREBASE_CERTS_URL,
+    settings.FIREBASE_CERTS_CACHE_PATH,
+    settings.FIREBASE_CERTS_FILE,
+)
+
+
+@lru_cache
+def firebase_project_id() -> str:
+    if settings.FIREBASE_PROJECT_ID:
+        return settings.FIREBASE_PROJECT_ID
+    if settings.FIREBASE_CREDENTIALS_PATH:
+        with open(settings.FIREBASE_CREDENTIALS_PATH) as f:
+            return json.load(f).get("project_id", "")
+    return ""
+
+
+def verify_id_token(token: str) -> dict:
+    """Verify a Firebase ID token locally against the cached signing keys."""
+    project_id = firebase_project_id()
+    if not project_id:
+        raise JWTError("Firebase project id is not configured")
+    header = jwt.get_unverified_header(token)
+    if header.get("alg") != "RS256":
+        raise JWTError("Unexpected token algorithm")
+    key = signing_keys.get(header.get("kid"))
+    if key is None:
+        raise JWTError("Unknown token signing key")
+    claims = jwt.decode(
+        token, key, algorithms=["RS256"],
+        audience=project_id, issuer=f"https://securetoken.google.com/{project_id}",
+    )
+    sub = claims.get("sub")
+    if not isinstance(sub, str) or not sub or len(sub) > 128:
+        raise JWTError("Invalid token subject")
+    if claims.get("auth_time", 0) > time.time():
+        raise JWTError("Token auth_time is in the future")
+    claims["uid"] = sub
+    return claims
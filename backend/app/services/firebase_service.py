@@ -1,15 +1,31 @@
 import secrets
-import json
-from urllib.request import Request, urlopen
-from urllib.error import URLError
+import threading
 
 import firebase_admin
+import requests
 from firebase_admin import credentials, auth as firebase_auth
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 from app.config import settings
+from app.services.firebase_keys import verify_id_token
+from app.utils.circuit_breaker import CircuitBreaker
 
 _initialized = False
 
+# Identity Toolkit REST calls run inside login requests, so they share one
+# pooled session with strict timeouts and fail fast while the provider is down.
+_http_session: requests.Session | None = None
+_http_session_lock = threading.Lock()
+identity_breaker = CircuitBreaker(
+    settings.FIREBASE_BREAKER_FAILURES, settings.FIREBASE_BREAKER_RESET_SECONDS
+)
+
+
+def firebase_configured() -> bool:
+    """Whether users can be synced at all: a service account or a Web API key."""
+    return bool(settings.FIREBASE_CREDENTIALS_PATH or settings.FIREBASE_API_KEY)
+
 
 def init_firebase():
     global _initialized
@@ -20,32 +36,83 @@ def init_firebase():
 
 
 def verify_firebase_token(token: str) -> dict:
-    init_firebase()
-    return firebase_auth.verify_id_token(token)
-
+    return verify_id_token(token)
+
+
+def _identity_session() -> requests.Session:
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            retries = Retry(
+                total=settings.FIREBASE_HTTP_RETRIES,
+                connect=settings.FIREBASE_HTTP_RETRIES,
+                read=0,
+                status=settings.FIREBASE_HTTP_RETRIES,
+                status_forcelist=(502, 503, 504),
+                allowed_methods=frozenset({"POST"}),
+                backoff_factor=0.2,
+            )
+            adapter = HTTPAdapter(pool_maxsize=settings.FIREBASE_HTTP_POOL_SIZE, max_retries=retries)
+            session = requests.Session()
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+class FirebaseSyncError(Exception):
+    """The identity provider did not confirm a user create/update."""
+
+
+def _identity_request(action: str, payload: dict) -> requests.Response | None:
+    """POST to the Identity Toolkit REST API; None when it could not be reached.
+
+    Transport errors and 5xx count against the circuit breaker; 4xx answers
+    (wrong password, EMAIL_EXISTS) are normal replies and do not.
+    """
+    if not settings.FIREBASE_API_KEY or not identity_breaker.allow():
+        return None
+    try:
+        resp = _identity_session().post(
+            f"{settings.FIREBASE_AUTH_BASE_URL.rstrip('/')}/accounts:{action}",
+            params={"key": settings.FIREBASE_API_KEY},
+            json={**payload, "returnSecureToken": True},
+            timeout=(settings.FIREBASE_HTTP_CONNECT_TIMEOUT, settings.FIREBASE_HTTP_READ_TIMEOUT),
+        )
+    except Exception:
+        identity_breaker.record_failure()
+        return None
+    if resp.status_code >= 500:
+        identity_breaker.record_failure()
+        return None
+    identity_breaker.record_success()
+    return resp
+
+
+def _identity_post(action: str, payload: dict) -> bool:
+    """Report whether the Identity Toolkit REST API accepted the request."""
+    resp = _identity_request(action, payload)
+    return resp is not None and resp.ok
+
+
+def _error_message(resp: requests.Response) -> str:
+    try:
+        return str(resp.json().get("error", {}).get("message", ""))
+    except ValueError:
+        return ""
 
-def _rest_api_create_user(email: str, password: str) -> bool:
-    """Create a Firebase Auth user via REST API (no service account needed)."""
-    if not settings.FIREBASE_API_KEY:
-        return False
 
-    url = (
-        "https://identitytoolkit.googleapis.com/v1/accounts:signUp"
-        f"?key={settings.FIREBASE_API_KEY}"
-    )
-    payload = json.dumps({
-        "email": email,
-        "password": password,
-        "returnSecureToken": True,
-    }).encode("utf-8")
+def _rest_api_create_user(email: str, password: str):
+    """Create a Firebase Auth user via REST API (no service account needed).
 
-    req = Request(url, data=payload, headers={"Content-Type": "application/json"})
-    try:
-        urlopen(req)
-        return True
-    except (URLError, Exception):
-        # EMAIL_EXISTS means user already exists — that's fine
-        return False
+    Raises FirebaseSyncError unless the user was created or already exists.
+    """
+    resp = _identity_request("signUp", {"email": email, "password": password})
+    if resp is None:
+        raise FirebaseSyncError("Identity provider unavailable")
+    # EMAIL_EXISTS means user already exists — that's fine
+    if not resp.ok and _error_message(resp) != "EMAIL_EXISTS":
+        raise FirebaseSyncError(f"signUp rejected: {_error_message(resp) or resp.status_code}")
 
 
 def ensure_firebase_user(email: str):
@@ -62,7 +129,10 @@ def ensure_firebase_user(email: str):
 
 
 def ensure_firebase_user_with_password(email: str, password: str):
-    """Create or update Firebase Auth user with a known password (for migration)."""
+    """Create or update Firebase Auth user with a known password (for migration).
+
+    Raises when the change was not confirmed, so callers can retry.
+    """
     init_firebase()
     if _initialized:
         try:
@@ -81,22 +151,4 @@ def verify_firebase_password(email: str, password: str) -> bool:
     Returns True if Firebase accepts the credentials, False otherwise.
     Requires FIREBASE_API_KEY to be set in settings.
     """
-    if not settings.FIREBASE_API_KEY:
-        return False
-
-    url = (
-        "https://identitytoolkit.googleapis.com/v1/accounts:signInWithPassword"
-        f"?key={settings.FIREBASE_API_KEY}"
-    )
-    payload = json.dumps({
-        "email": email,
-        "password": password,
-        "returnSecureToken": True,
-    }).encode("utf-8")
-
-    req = Request(url, data=payload, headers={"Content-Type": "application/json"})
-    try:
-        urlopen(req)
-        return True
-    except (URLError, Exception):
-        return False
+    return _identity_post("signInWithPassword", {"email": email, "password": password})
@@ -0,0 +1,110 @@
+import logging
+import threading
+from collections import OrderedDict
+
+from app.config import settings
+from app.services.firebase_service import (
+    FirebaseSyncError, ensure_firebase_user_with_password, firebase_configured, identity_breaker,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordSyncQueue:
+    """One background worker that pushes login passwords to Firebase Auth.
+
+    Jobs are coalesced per email (the newest password wins), the queue is bounded
+    (new emails are dropped when it is full), and a user whose current password
+    hash was already synced is skipped. Only a sync the provider confirmed is
+    counted and remembered; failures are logged and retried on a later login.
+    """
+
+    def __init__(self, maxsize: int, synced_cache_size: int):
+        self.maxsize = maxsize
+        self.synced_cache_size = synced_cache_size
+        self._pending: OrderedDict[str, tuple[str, str]] = OrderedDict()
+        self._synced: OrderedDict[str, str] = OrderedDict()
+        self._cond = threading.Condition()
+        self._worker: threading.Thread | None = None
+        self._stopping = False
+        self.enqueued = 0
+        self.coalesced = 0
+        self.skipped = 0
+        self.dropped = 0
+        self.synced = 0
+        self.failed = 0
+
+    def submit(self, email: str, password: str, hashed_password: str) -> bool:
+        """Queue a sync; returns False when it was skipped or dropped."""
+        if not firebase_configured():
+            return False
+        with self._cond:
+            if self._synced.get(email) == hashed_password:
+                self.skipped += 1
+                return False
+            if email in self._pending:
+                self.coalesced += 1
+            elif len(self._pending) >= self.maxsize:
+                self.dropped += 1
+                return False
+            else:
+                self.enqueued += 1
+            self._pending[email] = (password, hashed_password)
+            self._ensure_worker()
+            self._cond.notify()
+            return True
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._stopping = False
+            self._worker = threading.Thread(target=self._run, name="firebase-password-sync", daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopping:
+                    self._cond.wait()
+                if self._stopping:
+                    return
+                email, (password, hashed_password) = self._pending.popitem(last=False)
+            try:
+                ensure_firebase_user_with_password(email, password)
+            except FirebaseSyncError as exc:
+                logger.warning("Firebase password sync failed for %s: %s", email, exc)
+                with self._cond:
+                    self.failed += 1
+                continue
+            except Exception:
+                logger.warning("Firebase password sync failed for %s", email, exc_info=True)
+                with self._cond:
+                    self.failed += 1
+                continue
+            with self._cond:
+                self.synced += 1
+                self._synced[email] = hashed_password
+                self._synced.move_to_end(email)
+                while len(self._synced) > self.synced_cache_size:
+                    self._synced.popitem(last=False)
+
+    def stop(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify_all()
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                "depth": len(self._pending),
+                "max_depth": self.maxsize,
+                "enqueued_total": self.enqueued,
+                "coalesced_total": self.coalesced,
+                "skipped_total": self.skipped,
+                "dropped_total": self.dropped,
+                "synced_total": self.synced,
+                "failed_total": self.failed,
+                "identity_breaker": identity_breaker.state,
+            }
+
+
+password_sync_queue = PasswordSyncQueue(settings.FIREBASE_SYNC_QUEUE_SIZE, settings.FIREBASE_SYNC_CACHE_SIZE)
@@ -0,0 +1,204 @@
+import hashlib
+import multiprocessing
+import os
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from concurrent.futures.process import BrokenProcessPool
+
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.product import Product
+from app.utils.uploads import THUMBNAIL_SIZES, UPLOAD_URL_PREFIX
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+UPLOAD_DIR = os.path.join(BACKEND_DIR, "uploads", "products")
+ALLOWED_EXTENSIONS = {".jpg", ".jpeg", ".png", ".webp", ".gif"}
+MAX_FILE_SIZE = 5 * 1024 * 1024  # 5MB
+# Decoded size cap; a tiny file can still claim a huge canvas (decompression bomb)
+MAX_IMAGE_PIXELS = 40_000_000
+CHUNK_SIZE = 64 * 1024
+
+_image_pool: ProcessPoolExecutor | None = None
+_image_pool_lock = threading.Lock()
+_files_fallback_lock = threading.Lock()
+
+
+def _get_image_pool() -> ProcessPoolExecutor:
+    global _image_pool
+    with _image_pool_lock:
+        if _image_pool is None:
+            _image_pool = ProcessPoolExecutor(
+                max_workers=settings.IMAGE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _image_pool
+
+
+def shutdown_image_pool():
+    global _image_pool
+    with _image_pool_lock:
+        if _image_pool is not None:
+            _image_pool.shutdown(wait=False, cancel_futures=True)
+            _image_pool = None
+
+
+@contextmanager
+def image_files_lock(exclusive: bool = False):
+    """Lock on the upload directory, shared across worker processes.
+
+    Uploads hold it shared from storing a file until the product row pointing
+    at it is committed; deletes hold it exclusively around the reference
+    check, so a deduplicated file is never removed under an upload that is
+    about to use it.
+    """
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    if fcntl is None:
+        with _files_fallback_lock:
+            yield
+        return
+    with open(os.path.join(UPLOAD_DIR, ".lock"), "a") as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        yield
+
+
+def _store(source, ext: str) -> tuple[str, bool]:
+    """Copy an upload to disk in chunks under its content hash.
+
+    Returns the file name and whether this call created the file. Identical
+    content lands on the same name, so re-uploads are not stored twice.
+    """
+    os.makedirs(UPLOAD_DIR, exist_ok=True)
+    digest = hashlib.sha256()
+    size = 0
+    fd, tmp_path = tempfile.mkstemp(dir=UPLOAD_DIR, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while chunk := source.read(CHUNK_SIZE):
+                size += len(chunk)
+                if size > MAX_FILE_SIZE:
+                    raise HTTPException(status_code=413, detail="File too large. Maximum 5MB.")
+                digest.update(chunk)
+                out.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=400, detail="Empty file")
+        filename = f"{digest.hexdigest()[:32]}{ext}"
+        path = os.path.join(UPLOAD_DIR, filename)
+        if os.path.exists(path):
+            os.remove(tmp_path)
+            return filename, False
+        os.replace(tmp_path, path)
+        return filename, True
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def make_thumbnails(path: str, sizes: tuple[int, ...] = THUMBNAIL_SIZES) -> bool:
+    """Write <digest>_<width>.webp next to the original; False if it is not an image.
+
+    Runs in the image worker processes.
+    """
+    from PIL import Image, UnidentifiedImageError
+
+    Image.MAX_IMAGE_PIXELS = MAX_IMAGE_PIXELS
+    stem = os.path.splitext(path)[0]
+    try:
+        with Image.open(path) as image:
+            if image.width * image.height > MAX_IMAGE_PIXELS:
+                return False
+            image.verify()
+        with Image.open(path) as image:
+            image.seek(0)
+            image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+            for size in sizes:
+                target = f"{stem}_{size}.webp"
+                if os.path.exists(target):
+                    continue
+                thumb = image.copy()
+                thumb.thumbnail((size, size), Image.Resampling.LANCZOS)
+                tmp_target = f"{target}.part"
+                thumb.save(tmp_target, "WEBP", quality=80, method=4)
+                os.replace(tmp_target, target)
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError, SyntaxError, ValueError):
+        return False
+    return True
+
+
+def _remove_files(filename: str):
+    stem, _ = os.path.splitext(filename)
+    for name in [filename, *(f"{stem}_{size}.webp" for size in THUMBNAIL_SIZES)]:
+        path = os.path.join(UPLOAD_DIR, name)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def release_image(db: Session, image_url: str | None):
+    """Delete an image's files unless a product still uses them.
+
+    Call after the commit that stopped pointing at image_url, so a failed
+    commit never leaves a product referring to deleted files.
+    """
+    if not image_url:
+        return
+    with image_files_lock(exclusive=True):
+        if db.query(Product.id).filter(Product.image_url == image_url).first():
+            return
+        # Legacy uploads may live anywhere under the backend directory
+        abs_path = os.path.normpath(os.path.join(BACKEND_DIR, image_url.lstrip("/")))
+        if os.path.dirname(abs_path) == UPLOAD_DIR:
+            _remove_files(os.path.basename(abs_path))
+        elif abs_path.startswith(BACKEND_DIR + os.sep) and os.path.exists(abs_path):
+            os.remove(abs_path)
+
+
+def _check_image(path: str):
+    try:
+        if settings.IMAGE_WORKERS > 0:
+            is_image = _get_image_pool().submit(make_thumbnails, path).result()
+        else:
+            is_image = make_thumbnails(path)
+    except BrokenProcessPool:
+        shutdown_image_pool()
+        raise HTTPException(status_code=503, detail="Image processing is unavailable, please retry",
+                            headers={"Retry-After": "1"})
+    if not is_image:
+        raise HTTPException(status_code=400, detail="File is not a valid image")
+
+
+def set_product_image(db: Session, product: Product, upload) -> Product:
+    """Store an UploadFile and its thumbnails as the product's image, then release the old one."""
+    ext = os.path.splitext(upload.filename or "")[1].lower()
+    if ext not in ALLOWED_EXTENSIONS:
+        raise HTTPException(status_code=400, detail=f"File type not allowed. Use: {', '.join(ALLOWED_EXTENSIONS)}")
+
+    created_url = None
+    old_url = product.image_url
+    try:
+        with image_files_lock():
+            filename, created = _store(upload.file, ext)
+            image_url = f"{UPLOAD_URL_PREFIX}{filename}"
+            if created:
+                created_url = image_url
+            _check_image(os.path.join(UPLOAD_DIR, filename))
+            if old_url == image_url:
+                return product
+            product.image_url = image_url
+            db.commit()
+    except BaseException:
+        db.rollback()
+        # Only a file this upload created is a candidate, and only once the shared lock is dropped
+        release_image(db, created_url)
+        raise
+    release_image(db, old_url)
+    db.refresh(product)
+    return product
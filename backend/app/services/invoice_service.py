@@ -3,7 +3,7 @@ from datetime import date, timedelta
 import io
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.invoice import Invoice, InvoiceLine
 from app.models.subscription import Subscription, SubscriptionLine
@@ -13,10 +13,57 @@ from app.models.discount import Discount
 from app.models.user import User
 from app.enums import InvoiceStatus, SubscriptionStatus
 from app.utils.sequence import generate_sequence
+from app.utils.loading import eager
+from app.utils.pagination import paginate
+
+
+PAYMENT_TERM_DAYS = 30
+
+BILLING_PERIOD_DELTAS = {
+    "daily": timedelta(days=1),
+    "weekly": timedelta(weeks=1),
+    "monthly": timedelta(days=30),
+    "quarterly": timedelta(days=90),
+    "semi_annual": timedelta(days=180),
+    "yearly": timedelta(days=365),
+}
+
+
+def next_billing_date(current: date, billing_period) -> date:
+    period = billing_period.value if hasattr(billing_period, "value") else billing_period
+    return current + BILLING_PERIOD_DELTAS.get(period, timedelta(0))
+
+
+def compute_line_amounts(sl: SubscriptionLine, discount: Discount | None, tax: Tax | None) -> dict:
+    """Price one subscription line: discount first, then tax on the discounted amount."""
+    line_subtotal = Decimal(str(sl.quantity)) * sl.unit_price
+
+    line_discount = Decimal("0")
+    discount_applied = bool(discount and discount.is_active)
+    if discount_applied:
+        if discount.discount_type.value == "percentage":
+            line_discount = line_subtotal * discount.value / Decimal("100")
+        else:
+            line_discount = discount.value
+
+    discounted_subtotal = line_subtotal - line_discount
+
+    tax_amount = Decimal("0")
+    if tax:
+        tax_amount = discounted_subtotal * tax.rate / Decimal("100")
+
+    return {
+        "subtotal": line_subtotal,
+        "discount_amount": line_discount,
+        "tax_amount": tax_amount,
+        "line_total": discounted_subtotal + tax_amount,
+        "discount_applied": discount_applied,
+    }
 
 
 def generate_invoice(db: Session, subscription_id: int) -> Invoice:
-    sub = db.query(Subscription).filter(Subscription.id == subscription_id).first()
+    # Row lock so a concurrent billing worker cannot invoice the same period twice
+    sub = db.query(Subscription).filter(Subscription.id == subscription_id).with_for_update().first()
     if not sub:
         raise HTTPException(status_code=404, detail="Subscription not found")
     if sub.status not in [SubscriptionStatus.ACTIVE, SubscriptionStatus.CONFIRMED]:
@@ -28,7 +75,7 @@ def generate_invoice(db: Session, subscription_id: int) -> Invoice:
         subscription_id=sub.id,
         customer_id=sub.customer_id,
         issue_date=date.today(),
-        due_date=date.today() + timedelta(days=30),
+        due_date=date.today() + timedelta(days=PAYMENT_TERM_DAYS),
         status=InvoiceStatus.DRAFT,
         subtotal=Decimal("0"),
         tax_total=Decimal("0"),
@@ -45,31 +92,20 @@ def generate_invoice(db: Session, subscription_id: int) -> Invoice:
     sub_lines = db.query(SubscriptionLine).filter(
         SubscriptionLine.subscription_id == sub.id
     ).all()
+    discount_ids = {sl.discount_id for sl in sub_lines if sl.discount_id}
+    tax_ids = {sl.tax_id for sl in sub_lines if sl.tax_id}
+    discounts = {d.id: d for d in db.query(Discount).filter(Discount.id.in_(discount_ids))} if discount_ids else {}
+    taxes = {t.id: t for t in db.query(Tax).filter(Tax.id.in_(tax_ids))} if tax_ids else {}
 
     for sl in sub_lines:
-        line_subtotal = Decimal(str(sl.quantity)) * sl.unit_price
-
         # Apply discount if present on the subscription line
-        line_discount = Decimal("0")
-        if sl.discount_id:
-            disc = db.query(Discount).filter(Discount.id == sl.discount_id).first()
-            if disc and disc.is_active:
-                if disc.discount_type.value == "percentage":
-                    line_discount = line_subtotal * disc.value / Decimal("100")
-                else:
-                    line_discount = disc.value
-                # Increment usage count
-                disc.usage_count = (disc.usage_count or 0) + 1
-
-        discounted_subtotal = line_subtotal - line_discount
-
-        tax_amount = Decimal("0")
-        if sl.tax_id:
-            tax = db.query(Tax).filter(Tax.id == sl.tax_id).first()
-            if tax:
-                tax_amount = discounted_subtotal * tax.rate / Decimal("100")
-
-        line_total = discounted_subtotal + tax_amount
+        disc = discounts.get(sl.discount_id)
+        tax = taxes.get(sl.tax_id)
+
+        amounts = compute_line_amounts(sl, disc, tax)
+        if amounts["discount_applied"]:
+            # Increment usage count
+            disc.usage_count = (disc.usage_count or 0) + 1
 
         inv_line = InvoiceLine(
             invoice_id=invoice.id,
@@ -78,15 +114,15 @@ def generate_invoice(db: Session, subscription_id: int) -> Invoice:
             quantity=sl.quantity,
             unit_price=sl.unit_price,
             tax_id=sl.tax_id,
-            tax_amount=tax_amount,
-            discount_amount=line_discount,
-            line_total=line_total,
+            tax_amount=amounts["tax_amount"],
+            discount_amount=amounts["discount_amount"],
+            line_total=amounts["line_total"],
         )
         db.add(inv_line)
 
-        subtotal += line_subtotal
-        tax_total += tax_amount
-        discount_total += line_discount
+        subtotal += amounts["subtotal"]
+        tax_total += amounts["tax_amount"]
+        discount_total += amounts["discount_amount"]
 
     invoice.subtotal = subtotal
     invoice.tax_total = tax_total
@@ -95,22 +131,7 @@ def generate_invoice(db: Session, subscription_id: int) -> Invoice:
 
     # Advance next_invoice_date on the subscription
     if sub.next_invoice_date and sub.plan:
-        plan = sub.plan
-        period = plan.billing_period.value if hasattr(plan.billing_period, 'value') else plan.billing_period
-        next_date = sub.next_invoice_date
-        if period == 'daily':
-            next_date += timedelta(days=1)
-        elif period == 'weekly':
-            next_date += timedelta(weeks=1)
-        elif period == 'monthly':
-            next_date += timedelta(days=30)
-        elif period == 'quarterly':
-            next_date += timedelta(days=90)
-        elif period == 'semi_annual':
-            next_date += timedelta(days=180)
-        elif period == 'yearly':
-            next_date += timedelta(days=365)
-        sub.next_invoice_date = next_date
+        sub.next_invoice_date = next_billing_date(sub.next_invoice_date, sub.plan.billing_period)
 
     db.commit()
     db.refresh(invoice)
@@ -120,17 +141,20 @@ def generate_invoice(db: Session, subscription_id: int) -> Invoice:
 def get_invoices(
     db: Session, skip: int = 0, limit: int = 100,
     status_filter: str | None = None, customer_id: int | None = None,
+    cursor: str | None = None,
 ) -> list[Invoice]:
-    query = db.query(Invoice)
+    query = db.query(Invoice).options(*eager(selectinload(Invoice.lines)))
     if status_filter:
         query = query.filter(Invoice.status == status_filter)
     if customer_id:
         query = query.filter(Invoice.customer_id == customer_id)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, Invoice, skip, limit, cursor)
 
 
 def get_invoice(db: Session, invoice_id: int) -> Invoice:
-    invoice = db.query(Invoice).filter(Invoice.id == invoice_id).first()
+    invoice = db.query(Invoice).options(*eager(selectinload(Invoice.lines))).filter(
+        Invoice.id == invoice_id
+    ).first()
     if not invoice:
         raise HTTPException(status_code=404, detail="Invoice not found")
     return invoice
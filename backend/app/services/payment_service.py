@@ -8,6 +8,7 @@ from app.models.payment import Payment
 from app.models.invoice import Invoice
 from app.schemas.payment import PaymentCreate
 from app.enums import InvoiceStatus
+from app.utils.pagination import paginate
 
 
 def create_payment(db: Session, data: PaymentCreate, user_id: int) -> Payment:
@@ -44,13 +45,14 @@ def create_payment(db: Session, data: PaymentCreate, user_id: int) -> Payment:
 def get_payments(
     db: Session, skip: int = 0, limit: int = 100,
     invoice_id: int | None = None, customer_id: int | None = None,
+    cursor: str | None = None,
 ) -> list[Payment]:
     query = db.query(Payment)
     if invoice_id:
         query = query.filter(Payment.invoice_id == invoice_id)
     if customer_id:
         query = query.filter(Payment.user_id == customer_id)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, Payment, skip, limit, cursor)
 
 
 def get_payment(db: Session, payment_id: int) -> Payment:
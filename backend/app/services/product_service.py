@@ -1,8 +1,18 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.product import Product, ProductVariant
 from app.schemas.product import ProductCreate, ProductUpdate, VariantCreate, VariantUpdate
+from app.services import search_service
+from app.services.catalog_snapshot import catalog_snapshot
+from app.utils.loading import eager
+from app.utils.pagination import paginate
+
+
+def invalidate_catalog():
+    """Drop this worker's search index and catalog snapshot after a committed product or variant change."""
+    search_service.product_search_index.invalidate()
+    catalog_snapshot.invalidate()
 
 
 def create_product(db: Session, data: ProductCreate) -> Product:
@@ -12,19 +22,54 @@ def create_product(db: Session, data: ProductCreate) -> Product:
         sales_price=data.sales_price,
         cost_price=data.cost_price,
         description=data.description,
+        terms_and_conditions=data.terms_and_conditions,
+        guarantee_period=data.guarantee_period,
+        shipping_info=data.shipping_info,
+        category=data.category,
     )
     db.add(product)
     db.commit()
+    invalidate_catalog()
     db.refresh(product)
     return product
 
 
-def get_products(db: Session, skip: int = 0, limit: int = 100) -> list[Product]:
-    return db.query(Product).filter(Product.is_active == True).offset(skip).limit(limit).all()
+def get_products(db: Session, skip: int = 0, limit: int = 100,
+                 cursor: str | None = None) -> list[Product]:
+    query = db.query(Product).options(*eager(selectinload(Product.variants))).filter(
+        Product.is_active == True
+    )
+    return paginate(query, Product, skip, limit, cursor)
+
+
+def get_public_products(db: Session, search: str | None = None, product_type: str | None = None,
+                        skip: int = 0, limit: int = 100, cursor: str | None = None,
+                        category: str | None = None) -> list[Product]:
+    query = db.query(Product).options(*eager(selectinload(Product.variants))).filter(
+        Product.is_active == True
+    )
+    if search:
+        query = search_service.filter_query(db, query, search)
+    if product_type:
+        query = query.filter(Product.product_type == product_type)
+    if category:
+        query = query.filter(Product.category == category)
+    return paginate(query, Product, skip, limit, cursor)
+
+
+def get_public_product(db: Session, product_id: int) -> Product:
+    product = db.query(Product).options(*eager(selectinload(Product.variants))).filter(
+        Product.id == product_id, Product.is_active == True
+    ).first()
+    if not product:
+        raise HTTPException(status_code=404, detail="Product not found")
+    return product
 
 
 def get_product(db: Session, product_id: int) -> Product:
-    product = db.query(Product).filter(Product.id == product_id).first()
+    product = db.query(Product).options(*eager(selectinload(Product.variants))).filter(
+        Product.id == product_id
+    ).first()
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
     return product
@@ -36,6 +81,7 @@ def update_product(db: Session, product_id: int, data: ProductUpdate) -> Product
     for field, value in update_data.items():
         setattr(product, field, value)
     db.commit()
+    invalidate_catalog()
     db.refresh(product)
     return product
 
@@ -44,6 +90,7 @@ def delete_product(db: Session, product_id: int):
     product = get_product(db, product_id)
     product.is_active = False
     db.commit()
+    invalidate_catalog()
 
 
 def create_variant(db: Session, product_id: int, data: VariantCreate) -> ProductVariant:
@@ -56,6 +103,7 @@ def create_variant(db: Session, product_id: int, data: VariantCreate) -> Product
     )
     db.add(variant)
     db.commit()
+    invalidate_catalog()
     db.refresh(variant)
     return variant
 
@@ -73,6 +121,7 @@ def update_variant(db: Session, variant_id: int, data: VariantUpdate) -> Product
     for field, value in update_data.items():
         setattr(variant, field, value)
     db.commit()
+    invalidate_catalog()
     db.refresh(variant)
     return variant
 
@@ -83,3 +132,4 @@ def delete_variant(db: Session, variant_id: int):
         raise HTTPException(status_code=404, detail="Variant not found")
     db.delete(variant)
     db.commit()
+    invalidate_catalog()
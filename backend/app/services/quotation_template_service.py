@@ -1,8 +1,10 @@
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.quotation_template import QuotationTemplate, QuotationTemplateLine
 from app.schemas.quotation_template import QuotationTemplateCreate, QuotationTemplateUpdate
+from app.utils.loading import eager
+from app.utils.pagination import paginate
 
 
 def create_template(db: Session, data: QuotationTemplateCreate) -> QuotationTemplate:
@@ -28,12 +30,16 @@ def create_template(db: Session, data: QuotationTemplateCreate) -> QuotationTemp
     return template
 
 
-def get_templates(db: Session, skip: int = 0, limit: int = 100) -> list[QuotationTemplate]:
-    return db.query(QuotationTemplate).offset(skip).limit(limit).all()
+def get_templates(db: Session, skip: int = 0, limit: int = 100,
+                  cursor: str | None = None) -> list[QuotationTemplate]:
+    query = db.query(QuotationTemplate).options(*eager(selectinload(QuotationTemplate.lines)))
+    return paginate(query, QuotationTemplate, skip, limit, cursor)
 
 
 def get_template(db: Session, template_id: int) -> QuotationTemplate:
-    template = db.query(QuotationTemplate).filter(QuotationTemplate.id == template_id).first()
+    template = db.query(QuotationTemplate).options(
+        *eager(selectinload(QuotationTemplate.lines))
+    ).filter(QuotationTemplate.id == template_id).first()
     if not template:
         raise HTTPException(status_code=404, detail="Quotation template not found")
     return template
@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.models.recurring_plan import RecurringPlan
 from app.schemas.recurring_plan import RecurringPlanCreate, RecurringPlanUpdate
+from app.utils.pagination import paginate
 
 
 def create_plan(db: Session, data: RecurringPlanCreate) -> RecurringPlan:
@@ -24,8 +25,9 @@ def create_plan(db: Session, data: RecurringPlanCreate) -> RecurringPlan:
     return plan
 
 
-def get_plans(db: Session, skip: int = 0, limit: int = 100) -> list[RecurringPlan]:
-    return db.query(RecurringPlan).offset(skip).limit(limit).all()
+def get_plans(db: Session, skip: int = 0, limit: int = 100,
+              cursor: str | None = None) -> list[RecurringPlan]:
+    return paginate(db.query(RecurringPlan), RecurringPlan, skip, limit, cursor)
 
 
 def get_plan(db: Session, plan_id: int) -> RecurringPlan:
@@ -0,0 +1,225 @@
+import bisect
+import re
+import threading
+import time
+from collections import Counter
+
+from sqlalchemy import String, cast, func, literal, literal_column, select, union_all
+from sqlalchemy.orm import Session, selectinload
+
+from app.config import settings
+from app.database import SessionLocal
+from app.enums import ProductType
+from app.models.product import Product
+from app.utils.loading import eager
+
+TOKEN_RE = re.compile(r"[^\W_]+")
+MAX_QUERY_TERMS = 8
+MAX_SEARCH_LIMIT = 100
+# Relevance weights per field; Postgres uses the matching tsvector labels A/B/C
+NAME_WEIGHT, CATEGORY_WEIGHT, DESCRIPTION_WEIGHT = 3, 2, 1
+
+
+def tokenize(text: str | None) -> list[str]:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+
+def _query_terms(search: str) -> list[str]:
+    return list(dict.fromkeys(tokenize(search)))[:MAX_QUERY_TERMS]
+
+
+def search_vector():
+    """Weighted tsvector over name, category and description.
+
+    Must stay identical to the expression of the ix_products_search GIN index
+    (migration 0004) or Postgres will not use the index.
+    """
+    # Inlined literals, not bind parameters: the planner only matches an
+    # expression index against an identical expression
+    def weighted(column, label):
+        return func.setweight(
+            func.to_tsvector(literal_column("'simple'::regconfig"), func.coalesce(column, literal_column("''"))),
+            literal_column(f"'{label}'"),
+        )
+
+    return weighted(Product.name, "A").op("||")(weighted(Product.category, "B")).op("||")(
+        weighted(Product.description, "C")
+    )
+
+
+def _tsquery(terms: list[str]):
+    # Every term must match, each as a prefix so results follow the keystrokes
+    return func.to_tsquery(literal_column("'simple'::regconfig"), " & ".join(f"{term}:*" for term in terms))
+
+
+class ProductSearchIndex:
+    """In-memory inverted index over active products, for databases without full-text search.
+
+    Built from one query on first use and rebuilt after product changes in this
+    worker, or once it is older than SEARCH_INDEX_TTL_SECONDS (changes made by
+    other workers).
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._state = None
+        self._built_at = 0.0
+
+    def invalidate(self):
+        self._state = None
+
+    def _build(self):
+        db = SessionLocal()
+        try:
+            rows = db.query(
+                Product.id, Product.name, Product.category, Product.description, Product.product_type,
+            ).filter(Product.is_active == True).all()  # noqa: E712
+        finally:
+            db.close()
+        postings: dict[str, dict[int, int]] = {}
+        facets: dict[int, tuple[str | None, str]] = {}
+        for product_id, name, category, description, product_type in rows:
+            facets[product_id] = (category, product_type.value)
+            for text, weight in ((name, NAME_WEIGHT), (category, CATEGORY_WEIGHT), (description, DESCRIPTION_WEIGHT)):
+                for token in tokenize(text):
+                    scores = postings.setdefault(token, {})
+                    scores[product_id] = scores.get(product_id, 0) + weight
+        return sorted(postings), postings, facets
+
+    def _current(self):
+        state = self._state
+        if state is not None and time.monotonic() - self._built_at < self.ttl_seconds:
+            return state
+        with self._lock:
+            if self._state is None or time.monotonic() - self._built_at >= self.ttl_seconds:
+                self._state = self._build()
+                self._built_at = time.monotonic()
+            return self._state
+
+    def search(self, terms: list[str]) -> tuple[dict[int, int], dict[int, tuple[str | None, str]]]:
+        """Return {product id: score} for products matching every term (as a prefix), plus facet data.
+
+        No terms matches every product with score 0.
+        """
+        tokens, postings, facets = self._current()
+        if not terms:
+            return dict.fromkeys(facets, 0), facets
+        scores: Counter | None = None
+        for term in terms:
+            term_scores: Counter = Counter()
+            start = bisect.bisect_left(tokens, term)
+            for token in tokens[start:]:
+                if not token.startswith(term):
+                    break
+                for product_id, score in postings[token].items():
+                    term_scores[product_id] = max(term_scores[product_id], score)
+            if scores is None:
+                scores = term_scores
+            else:
+                scores = Counter({pid: scores[pid] + s for pid, s in term_scores.items() if pid in scores})
+            if not scores:
+                break
+        return dict(scores or {}), facets
+
+
+product_search_index = ProductSearchIndex(settings.SEARCH_INDEX_TTL_SECONDS)
+
+
+def use_full_text(db: Session) -> bool:
+    if settings.SEARCH_BACKEND == "auto":
+        return db.get_bind().dialect.name == "postgresql"
+    return settings.SEARCH_BACKEND == "postgres"
+
+
+def filter_query(db: Session, query, search: str):
+    """Restrict a Product query to products matching `search`, keeping its ordering."""
+    terms = _query_terms(search)
+    if not terms:
+        return query
+    if use_full_text(db):
+        return query.filter(search_vector().op("@@")(_tsquery(terms)))
+    scores, _ = product_search_index.search(terms)
+    return query.filter(Product.id.in_(scores))
+
+
+def _facet_counts(pairs) -> list[dict]:
+    pairs = [(value, count) for value, count in pairs if value is not None]
+    return [{"value": value, "count": count} for value, count in sorted(pairs, key=lambda pair: (-pair[1], pair[0]))]
+
+
+def _search_full_text(db: Session, terms, category, product_type, offset, limit):
+    conditions = [Product.is_active == True]  # noqa: E712
+    if terms:
+        conditions.append(search_vector().op("@@")(_tsquery(terms)))
+    category_filter = [Product.category == category] if category else []
+    type_filter = [Product.product_type == product_type] if product_type else []
+
+    rank = func.ts_rank(search_vector(), _tsquery(terms)) if terms else literal(0)
+    page = db.execute(
+        select(Product.id, func.count().over().label("total"))
+        .where(*conditions, *category_filter, *type_filter)
+        .order_by(rank.desc(), Product.id)
+        .offset(offset).limit(limit)
+    ).all()
+    # Each facet is counted under the other facet's filter, so picking a
+    # category still shows how many results every other category has
+    facet_rows = db.execute(union_all(
+        select(literal_column("'category'").label("facet"), Product.category.label("value"), func.count())
+        .where(*conditions, *type_filter).group_by(Product.category),
+        select(literal_column("'product_type'"), cast(Product.product_type, String), func.count())
+        .where(*conditions, *category_filter).group_by(Product.product_type),
+    )).all()
+
+    facets = {"category": [], "product_type": []}
+    for facet, value, count in facet_rows:
+        facets[facet].append((value, count))
+    # The enum column stores member names
+    facets["product_type"] = [(ProductType[value].value, count) for value, count in facets["product_type"]]
+    total = page[0].total if page else 0
+    if not page and offset:
+        total = db.execute(
+            select(func.count()).select_from(Product).where(*conditions, *category_filter, *type_filter)
+        ).scalar()
+    return [row.id for row in page], total, facets
+
+
+def _search_memory(terms, category, product_type, offset, limit):
+    scores, facet_data = product_search_index.search(terms)
+    category_counts, type_counts = Counter(), Counter()
+    matched = []
+    for product_id, score in scores.items():
+        product_category, product_type_value = facet_data[product_id]
+        category_ok = not category or product_category == category
+        type_ok = not product_type or product_type_value == product_type
+        if type_ok:
+            category_counts[product_category] += 1
+        if category_ok:
+            type_counts[product_type_value] += 1
+        if category_ok and type_ok:
+            matched.append((-score, product_id))
+    matched.sort()
+    ids = [product_id for _, product_id in matched[offset:offset + limit]]
+    facets = {"category": list(category_counts.items()), "product_type": list(type_counts.items())}
+    return ids, len(matched), facets
+
+
+def search_products(db: Session, search: str | None = None, category: str | None = None,
+                    product_type: str | None = None, offset: int = 0, limit: int = 20) -> dict:
+    """Relevance-ranked active products with facet counts by category and product type."""
+    terms = _query_terms(search or "")
+    offset, limit = max(offset, 0), min(max(limit, 1), MAX_SEARCH_LIMIT)
+    if use_full_text(db):
+        ids, total, facets = _search_full_text(db, terms, category, product_type, offset, limit)
+    else:
+        ids, total, facets = _search_memory(terms, category, product_type, offset, limit)
+
+    products = db.query(Product).options(*eager(selectinload(Product.variants))).filter(
+        Product.id.in_(ids)
+    ).all() if ids else []
+    by_id = {product.id: product for product in products}
+    return {
+        "total": total,
+        "items": [by_id[product_id] for product_id in ids if product_id in by_id],
+        "facets": {name: _facet_counts(pairs) for name, pairs in facets.items()},
+    }
@@ -2,7 +2,8 @@ from decimal import Decimal
 from datetime import date
 
 from fastapi import HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
 
 from app.models.subscription import Subscription, SubscriptionLine
 from app.models.recurring_plan import RecurringPlan
@@ -15,6 +16,8 @@ from app.schemas.subscription import (
 from app.models.invoice import Invoice
 from app.enums import SubscriptionStatus, InvoiceStatus
 from app.utils.sequence import generate_sequence
+from app.utils.loading import eager
+from app.utils.pagination import paginate
 
 
 VALID_TRANSITIONS = {
@@ -78,17 +81,20 @@ def create_subscription(db: Session, data: SubscriptionCreate) -> Subscription:
 def get_subscriptions(
     db: Session, skip: int = 0, limit: int = 100,
     status_filter: str | None = None, customer_id: int | None = None,
+    cursor: str | None = None,
 ) -> list[Subscription]:
-    query = db.query(Subscription)
+    query = db.query(Subscription).options(*eager(selectinload(Subscription.lines)))
     if status_filter:
         query = query.filter(Subscription.status == status_filter)
     if customer_id:
         query = query.filter(Subscription.customer_id == customer_id)
-    return query.offset(skip).limit(limit).all()
+    return paginate(query, Subscription, skip, limit, cursor)
 
 
 def get_subscription(db: Session, sub_id: int) -> Subscription:
-    sub = db.query(Subscription).filter(Subscription.id == sub_id).first()
+    sub = db.query(Subscription).options(*eager(selectinload(Subscription.lines))).filter(
+        Subscription.id == sub_id
+    ).first()
     if not sub:
         raise HTTPException(status_code=404, detail="Subscription not found")
     return sub
@@ -302,19 +308,32 @@ def get_subscription_history(db: Session, sub_id: int) -> list[Subscription]:
     sub = get_subscription(db, sub_id)
     history = []
 
-    # Walk up to root parent
-    current = sub
-    while current.parent_id:
-        parent = db.query(Subscription).filter(Subscription.id == current.parent_id).first()
-        if not parent:
-            break
-        history.insert(0, parent)
-        current = parent
+    # Walk up to root parent, fetching every ancestor in one recursive query
+    if sub.parent_id:
+        ancestors = select(Subscription.id, Subscription.parent_id).where(
+            Subscription.id == sub.parent_id
+        ).cte("ancestors", recursive=True)
+        ancestors = ancestors.union(
+            select(Subscription.id, Subscription.parent_id).join(
+                ancestors, Subscription.id == ancestors.c.parent_id
+            )
+        )
+        parents = {
+            p.id: p for p in db.query(Subscription).options(*eager(selectinload(Subscription.lines))).filter(
+                Subscription.id.in_(select(ancestors.c.id))
+            )
+        }
+        current = sub
+        while current.parent_id in parents and parents[current.parent_id] not in history:
+            current = parents[current.parent_id]
+            history.insert(0, current)
 
     history.append(sub)
 
     # Add children
-    children = db.query(Subscription).filter(Subscription.parent_id == sub.id).all()
+    children = db.query(Subscription).options(*eager(selectinload(Subscription.lines))).filter(
+        Subscription.parent_id == sub.id
+    ).all()
     history.extend(children)
 
     return history
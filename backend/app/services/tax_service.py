@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 
 from app.models.tax import Tax
 from app.schemas.tax import TaxCreate, TaxUpdate
+from app.utils.pagination import paginate
 
 
 def create_tax(db: Session, data: TaxCreate) -> Tax:
@@ -18,8 +19,9 @@ def create_tax(db: Session, data: TaxCreate) -> Tax:
     return tax
 
 
-def get_taxes(db: Session, skip: int = 0, limit: int = 100) -> list[Tax]:
-    return db.query(Tax).filter(Tax.is_active == True).offset(skip).limit(limit).all()
+def get_taxes(db: Session, skip: int = 0, limit: int = 100, cursor: str | None = None) -> list[Tax]:
+    query = db.query(Tax).filter(Tax.is_active == True)
+    return paginate(query, Tax, skip, limit, cursor)
 
 
 def get_tax(db: Session, tax_id: int) -> Tax:
@@ -0,0 +1,119 @@
+import csv
+import io
+
+from fastapi import HTTPException
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.enums import UserRole
+from app.models.user import User
+from app.schemas.user import BulkUserItem, BulkUserResult, BulkUserSkipped
+from app.services.auth_service import hash_passwords
+from app.services.firebase_sync import password_sync_queue
+from app.utils.password import validate_password
+
+BULK_USER_LIMIT = 10_000
+BULK_ROLES = {UserRole.PORTAL.value, UserRole.INTERNAL.value}
+CSV_COLUMNS = ["email", "full_name", "password", "phone", "company", "role"]
+
+
+def _row_errors(item: BulkUserItem) -> list[str]:
+    errors = []
+    if item.role not in BULK_ROLES:
+        errors.append("Role must be portal or internal")
+    if item.password is not None:
+        try:
+            validate_password(item.password)
+        except HTTPException as exc:
+            errors.extend(exc.detail)
+    return errors
+
+
+def parse_users_csv(content: bytes) -> list[BulkUserItem]:
+    """Parse a CSV with an email,full_name,password,phone,company,role header."""
+    try:
+        reader = csv.DictReader(io.StringIO(content.decode("utf-8-sig")))
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="CSV must be UTF-8 encoded")
+    missing = {"email", "full_name"} - set(reader.fieldnames or [])
+    if missing:
+        raise HTTPException(status_code=400, detail=f"CSV is missing columns: {', '.join(sorted(missing))}")
+    items, errors = [], []
+    for index, row in enumerate(reader):
+        values = {key: (row.get(key) or "").strip() or None for key in CSV_COLUMNS}
+        if values["role"] is None:
+            del values["role"]
+        try:
+            items.append(BulkUserItem(**values))
+        except ValidationError as exc:
+            errors.append({"row": index, "email": values["email"], "errors": [e["msg"] for e in exc.errors()]})
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+    return items
+
+
+def bulk_create_users(db: Session, items: list[BulkUserItem], sync_firebase: bool = False) -> BulkUserResult:
+    """Create users in one INSERT, skipping emails that are already registered.
+
+    Invalid rows reject the whole batch before anything is hashed or written.
+    Passwords are optional; users imported without one set it through the
+    forgot-password flow.
+    """
+    if len(items) > BULK_USER_LIMIT:
+        raise HTTPException(status_code=400, detail=f"At most {BULK_USER_LIMIT} users per request")
+    errors = []
+    for index, item in enumerate(items):
+        row_errors = _row_errors(item)
+        if row_errors:
+            errors.append({"row": index, "email": item.email, "errors": row_errors})
+    if errors:
+        raise HTTPException(status_code=422, detail=errors)
+
+    emails = {item.email for item in items}
+    existing = {
+        email for (email,) in db.query(User.email).filter(User.email.in_(emails)).all()
+    } if emails else set()
+
+    skipped, to_create, seen = [], [], set()
+    for item in items:
+        if item.email in existing:
+            skipped.append(BulkUserSkipped(email=item.email, reason="Email already registered"))
+        elif item.email in seen:
+            skipped.append(BulkUserSkipped(email=item.email, reason="Duplicate email in request"))
+        else:
+            seen.add(item.email)
+            to_create.append(item)
+
+    with_password = [item for item in to_create if item.password is not None]
+    hashes = dict(zip(
+        (item.email for item in with_password),
+        hash_passwords([item.password for item in with_password]),
+    ))
+    rows = [
+        {
+            "email": item.email,
+            "hashed_password": hashes.get(item.email),
+            "full_name": item.full_name,
+            "phone": item.phone,
+            "company": item.company,
+            "role": UserRole(item.role),
+            "is_active": True,
+        }
+        for item in to_create
+    ]
+    if rows:
+        try:
+            db.execute(insert(User), rows)
+            db.commit()
+        except IntegrityError:
+            db.rollback()
+            raise HTTPException(status_code=409, detail="Some emails were registered meanwhile, please retry the import")
+
+    firebase_queued = 0
+    if sync_firebase:
+        for item in with_password:
+            if password_sync_queue.submit(item.email, item.password, hashes[item.email]):
+                firebase_queued += 1
+    return BulkUserResult(created=len(rows), skipped=skipped, firebase_queued=firebase_queued)
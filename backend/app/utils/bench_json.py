@@ -0,0 +1,93 @@
+import argparse
+import json
+import statistics
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.enums import InvoiceStatus
+from app.models import Invoice, InvoiceLine
+from app.schemas.invoice import InvoiceOut
+from app.utils.json_response import FastJSONResponse
+from app.utils.serialization import dump_trusted, trusted_response
+
+
+def _invoices(count: int, lines_per_invoice: int) -> list[Invoice]:
+    """Transient invoices shaped like the ones the list endpoint returns."""
+    today = date.today()
+    invoices = []
+    for i in range(1, count + 1):
+        lines = [
+            InvoiceLine(
+                id=i * lines_per_invoice + n, product_id=n + 1, description=f"Plan seat {n}", quantity=n + 1,
+                unit_price=Decimal("49.99"), tax_id=1, tax_amount=Decimal("9.00"),
+                discount_amount=Decimal("5.00"), line_total=Decimal("53.99") * (n + 1),
+            )
+            for n in range(lines_per_invoice)
+        ]
+        subtotal = sum((line.line_total for line in lines), Decimal("0.00"))
+        invoices.append(Invoice(
+            id=i, invoice_number=f"INV-{i:06d}", subscription_id=i, customer_id=i % 50 + 1,
+            issue_date=today, due_date=today + timedelta(days=30), status=InvoiceStatus.CONFIRMED,
+            subtotal=subtotal, tax_total=Decimal("9.00") * lines_per_invoice,
+            discount_total=Decimal("5.00") * lines_per_invoice, total=subtotal, notes=None, lines=lines,
+        ))
+    return invoices
+
+
+def _time(fn, repeat: int) -> float:
+    """Median wall time of fn in ms."""
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare stdlib json, orjson and the trusted (validation-free) path for a list[InvoiceOut] response."
+    )
+    parser.add_argument("--invoices", type=int, default=1000)
+    parser.add_argument("--lines", type=int, default=3, help="Lines per invoice")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    adapter = TypeAdapter(list[InvoiceOut])
+    invoices = _invoices(args.invoices, args.lines)
+    # What FastAPI hands the response class for response_model=list[InvoiceOut]
+    content = adapter.dump_python(adapter.validate_python(invoices, from_attributes=True), mode="json")
+
+    stdlib_body = JSONResponse(content).body
+    fast_body = FastJSONResponse(content).body
+    if json.loads(stdlib_body) != json.loads(fast_body):
+        raise SystemExit("Bodies differ between JSONResponse and FastJSONResponse")
+    if dump_trusted(invoices, InvoiceOut) != content:
+        raise SystemExit("Trusted output differs from response_model output")
+
+    def full(response_class):
+        data = adapter.dump_python(adapter.validate_python(invoices, from_attributes=True), mode="json")
+        return response_class(data)
+
+    encode_stdlib = _time(lambda: JSONResponse(content), args.repeat)
+    encode_fast = _time(lambda: FastJSONResponse(content), args.repeat)
+    full_stdlib = _time(lambda: full(JSONResponse), args.repeat)
+    full_fast = _time(lambda: full(FastJSONResponse), args.repeat)
+    full_trusted = _time(lambda: trusted_response(invoices, InvoiceOut), args.repeat)
+
+    print(f"{args.invoices} invoices x {args.lines} lines, {len(fast_body) / 1024:.0f} KiB body, "
+          f"identical output: {stdlib_body == fast_body}")
+    print(f"  encode only   json {encode_stdlib:8.2f} ms   orjson {encode_fast:8.2f} ms   "
+          f"x{encode_stdlib / encode_fast:.1f}")
+    print(f"  full response json {full_stdlib:8.2f} ms   orjson {full_fast:8.2f} ms   "
+          f"x{full_stdlib / full_fast:.1f}")
+    print(f"  trusted       json {full_stdlib:8.2f} ms   orjson {full_trusted:8.2f} ms   "
+          f"x{full_stdlib / full_trusted:.1f}")
+
+
+if __name__ == "__main__":
+    main()
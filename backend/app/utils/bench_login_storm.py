@@ -0,0 +1,96 @@
+import argparse
+import json
+import multiprocessing
+import statistics
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _request(url: str, body: dict | None = None) -> tuple[int, float]:
+    """Return the status code and the Retry-After delay, if any."""
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as resp:
+            resp.read()
+            return resp.status, 0
+    except urllib.error.HTTPError as exc:
+        return exc.code, float(exc.headers.get("Retry-After") or 0)
+
+
+def _probe(url: str, seconds: float) -> list[float]:
+    """Hit a cheap endpoint back to back and return latencies in ms."""
+    latencies = []
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        _request(url)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def _storm(base_url: str, email: str, password: str, concurrency: int, stop, results):
+    """Login clients, run in their own process so they don't share the probe's GIL."""
+    statuses: dict[int, int] = {}
+    lock = threading.Lock()
+
+    def worker():
+        while not stop.is_set():
+            code, retry_after = _request(f"{base_url}/api/auth/login", {"email": email, "password": password})
+            with lock:
+                statuses[code] = statuses.get(code, 0) + 1
+            if retry_after:
+                stop.wait(retry_after)
+
+    with ThreadPoolExecutor(concurrency) as pool:
+        for _ in range(concurrency):
+            pool.submit(worker)
+        stop.wait()
+    results.put(statuses)
+
+
+def _percentiles(latencies: list[float]) -> str:
+    if len(latencies) < 2:
+        return f"n={len(latencies)} (probe starved) max={max(latencies, default=0):.1f}ms"
+    cuts = statistics.quantiles(latencies, n=100)
+    return f"n={len(latencies)} p50={cuts[49]:.1f}ms p99={cuts[98]:.1f}ms max={max(latencies):.1f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Compare latency of a cheap endpoint with and without a concurrent login storm."
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", default="admin@subtrack.com")
+    parser.add_argument("--password", default="Admin@123!")
+    parser.add_argument("--probe-path", default="/api/products/public?limit=20")
+    parser.add_argument("--concurrency", type=int, default=50, help="Concurrent login clients")
+    parser.add_argument("--seconds", type=float, default=10)
+    args = parser.parse_args()
+
+    probe_url = args.base_url + args.probe_path
+    print(f"baseline     {_percentiles(_probe(probe_url, args.seconds))}")
+
+    stop = multiprocessing.Event()
+    results = multiprocessing.Queue()
+    storm = multiprocessing.Process(
+        target=_storm,
+        args=(args.base_url, args.email, args.password, args.concurrency, stop, results),
+    )
+    storm.start()
+    try:
+        time.sleep(1)  # let the storm ramp up
+        latencies = _probe(probe_url, args.seconds)
+    finally:
+        stop.set()
+    statuses = results.get()
+    storm.join()
+    print(f"login storm  {_percentiles(latencies)}")
+    print(f"login responses: {dict(sorted(statuses.items()))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import argparse
+import os
+import socket
+from datetime import date
+
+from app.database import SessionLocal
+from app.services.billing_service import DEFAULT_CHUNK_SIZE, run_billing, run_billing_worker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Invoice all ACTIVE subscriptions that are due.")
+    parser.add_argument("--date", type=date.fromisoformat, default=None,
+                        help="Run date (YYYY-MM-DD), defaults to today")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--partitions", type=int, default=None,
+                        help="Join a checkpointed run split into this many partitions; "
+                             "start the same command on every worker")
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.partitions:
+            summary = run_billing_worker(db, args.worker_id, args.date, args.partitions, args.chunk_size)
+        else:
+            summary = run_billing(db, args.date, args.chunk_size)
+    finally:
+        db.close()
+
+    if args.partitions:
+        print(f"Billing run #{summary['run_id']} ({summary['run_date']}) worker {summary['worker_id']}: "
+              f"{summary['invoices_created']} invoiced from partitions {summary['partitions_completed']}, "
+              f"failed {summary['partitions_failed']}, total {summary['total_amount']} "
+              f"in {summary['duration_ms']} ms; run is {summary['run_status']}")
+        return
+
+    print(f"Billing run {summary['run_date']}: "
+          f"{summary['invoices_created']}/{summary['subscriptions_due']} invoiced, "
+          f"{summary['chunks_failed']} chunk(s) failed, "
+          f"total {summary['total_amount']} in {summary['duration_ms']} ms")
+    if summary["failed_subscription_ids"]:
+        print(f"Failed subscriptions: {summary['failed_subscription_ids']}")
+
+
+if __name__ == "__main__":
+    main()
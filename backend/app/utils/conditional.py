@@ -0,0 +1,125 @@
+import hashlib
+import threading
+import time
+from datetime import timezone
+from email.utils import format_datetime
+
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy import Table, event, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.dependencies import get_db
+from app.models.table_version import VERSIONED_TABLES, TableVersion
+
+# Appended inside the quotes of an ETag for a gzip-encoded representation
+GZIP_ETAG_SUFFIX = "-gzip"
+
+
+class TableVersions:
+    """Per-worker cache of each table's change counter from table_versions, as (version, updated_at).
+
+    Commits in this worker that touch a table drop its entry right away;
+    changes made by other workers show up once the entry is older than the TTL.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._entries: dict[str, tuple[float, tuple]] = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self, table_names):
+        with self._lock:
+            for name in table_names:
+                self._entries.pop(name, None)
+
+    def get(self, db: Session, tables: tuple[Table, ...]) -> dict[str, tuple]:
+        now = time.monotonic()
+        versions, missing = {}, []
+        for table in tables:
+            entry = self._entries.get(table.name)
+            if entry is not None and entry[0] > now:
+                versions[table.name] = entry[1]
+            else:
+                missing.append(table.name)
+        if missing:
+            counters = TableVersion.__table__
+            rows = {name: (version, updated_at) for name, version, updated_at in db.execute(
+                select(counters.c.table_name, counters.c.version, counters.c.updated_at)
+                .where(counters.c.table_name.in_(missing))
+            )}
+            with self._lock:
+                for name in missing:
+                    versions[name] = rows.get(name, (0, None))
+                    self._entries[name] = (now + self.ttl_seconds, versions[name])
+        return versions
+
+
+table_versions = TableVersions(settings.CATALOG_VERSION_TTL_SECONDS)
+
+
+# session.info["changed_tables"] is filled by the counter hooks in app.models.table_version
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_tables(session):
+    changed = session.info.pop("changed_tables", None)
+    if changed:
+        table_versions.invalidate(changed)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_changed_tables(session):
+    session.info.pop("changed_tables", None)
+
+
+def copy_response_headers(source: Response, target: Response) -> Response:
+    """Carry headers set on an injected Response over to the one actually returned.
+
+    Works on the raw list, so repeated headers such as Set-Cookie all survive.
+    """
+    target.raw_headers.extend(
+        (key, value) for key, value in source.raw_headers if key not in (b"content-length", b"content-type")
+    )
+    return target
+
+
+def _matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = (tag.strip().removeprefix("W/").replace(f'{GZIP_ETAG_SUFFIX}"', '"') for tag in if_none_match.split(","))
+    return etag in tags
+
+
+def conditional_get(*models, public: bool = False):
+    """Route dependency that answers If-None-Match with 304 before the handler runs.
+
+    The strong ETag hashes the change counters of the models' tables with the
+    request path and query string, so a hit costs at most one primary-key
+    lookup and nothing is loaded or serialized.
+    """
+    tables = tuple(table for model in models for table in model.__mapper__.tables)
+    untracked = [table.name for table in tables if table.name not in VERSIONED_TABLES]
+    if untracked:
+        raise ValueError(f"Tables without a change counter: {', '.join(untracked)}")
+    if public:
+        cache_control = f"public, max-age={settings.CATALOG_CACHE_MAX_AGE}, must-revalidate"
+    else:
+        cache_control = "private, no-cache"
+
+    def dependency(request: Request, response: Response, db: Session = Depends(get_db)):
+        versions = table_versions.get(db, tables)
+        seed = "|".join(f"{name}:{versions[name][0]}" for name in sorted(versions))
+        digest = hashlib.sha256(f"{seed}|{request.url.path}?{request.url.query}".encode()).hexdigest()
+        headers = {"ETag": f'"{digest[:32]}"', "Cache-Control": cache_control}
+        modified = [updated_at for _, updated_at in versions.values() if updated_at is not None]
+        if modified:
+            last_modified = max(modified)
+            if last_modified.tzinfo is None:
+                last_modified = last_modified.replace(tzinfo=timezone.utc)
+            headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+        if _matches(request.headers.get("If-None-Match"), headers["ETag"]):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        response.headers.update(headers)
+
+    return dependency
@@ -0,0 +1,129 @@
+import argparse
+import sys
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+from sqlalchemy import event, text
+
+from app.database import SessionLocal
+from app.enums import InvoiceStatus, SubscriptionStatus
+from app.services import (
+    billing_service, invoice_service, payment_service, report_service, search_service,
+    subscription_service,
+)
+
+# Tables that grow with the business; a sequential scan on any of them is a regression
+HOT_TABLES = {
+    "subscriptions", "subscription_lines", "invoices", "invoice_lines", "payments",
+    "cart_items", "contacts", "discounts", "products", "product_variants",
+}
+
+
+def _checks() -> list[tuple[str, callable]]:
+    today = date.today()
+    month_ago = today - timedelta(days=30)
+    return [
+        ("report_service.get_active_subscriptions", report_service.get_active_subscriptions),
+        ("report_service.get_revenue", lambda db: report_service.get_revenue(db, month_ago, today)),
+        ("report_service.get_payments_summary",
+         lambda db: report_service.get_payments_summary(db, month_ago, today)),
+        ("report_service.get_overdue_invoices", report_service.get_overdue_invoices),
+        ("invoice_service.get_invoices(status)",
+         lambda db: invoice_service.get_invoices(db, status_filter=InvoiceStatus.CONFIRMED)),
+        ("invoice_service.get_invoices(customer)",
+         lambda db: invoice_service.get_invoices(db, customer_id=1)),
+        ("subscription_service.get_subscriptions(status)",
+         lambda db: subscription_service.get_subscriptions(db, status_filter=SubscriptionStatus.ACTIVE)),
+        ("subscription_service.get_subscriptions(customer)",
+         lambda db: subscription_service.get_subscriptions(db, customer_id=1)),
+        ("payment_service.get_payments(invoice)", lambda db: payment_service.get_payments(db, invoice_id=1)),
+        ("billing_service.get_due_subscription_ids",
+         lambda db: billing_service.get_due_subscription_ids(db, today)),
+        ("search_service.search_products", lambda db: search_service.search_products(db, "widget")),
+    ]
+
+
+@contextmanager
+def _capture_statements(db):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append((statement, parameters))
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def _postgres_seq_scans(plan: dict) -> list[str]:
+    found = []
+    if plan.get("Node Type") == "Seq Scan" and plan.get("Relation Name") in HOT_TABLES:
+        found.append(f"Seq Scan on {plan['Relation Name']}")
+    for child in plan.get("Plans", []):
+        found.extend(_postgres_seq_scans(child))
+    return found
+
+
+def _explain(conn, statement: str, parameters) -> tuple[list[str], list[str]]:
+    """Return (plan lines, sequential scans on hot tables) for one captured statement."""
+    if conn.dialect.name == "postgresql":
+        result = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters).scalar()
+        root = result[0]["Plan"]
+        plan_text = conn.exec_driver_sql(f"EXPLAIN {statement}", parameters).scalars().all()
+        return plan_text, _postgres_seq_scans(root)
+
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+    details = [row[-1] for row in rows]
+    scans = [
+        detail for detail in details
+        if detail.startswith("SCAN ") and "USING" not in detail
+        and detail.split()[1] in HOT_TABLES
+    ]
+    return details, scans
+
+
+def run_checks(show_plans: bool = False) -> int:
+    db = SessionLocal()
+    failures = 0
+    try:
+        conn = db.connection()
+        if conn.dialect.name == "postgresql":
+            # Small dev tables make seq scans the cheapest plan; forbid them so any
+            # remaining Seq Scan means no usable index exists.
+            conn.execute(text("SET LOCAL enable_seqscan = off"))
+
+        for name, check in _checks():
+            with _capture_statements(db) as statements:
+                check(db)
+            for statement, parameters in statements:
+                plan, scans = _explain(conn, statement, parameters)
+                status = "FAIL" if scans else "ok"
+                print(f"[{status}] {name}: {' '.join(statement.split())[:120]}")
+                if show_plans or scans:
+                    for line in plan:
+                        print(f"        {line}")
+                failures += bool(scans)
+    finally:
+        db.rollback()
+        db.close()
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="EXPLAIN the hot service queries and fail if any falls back to a sequential scan.")
+    parser.add_argument("--show", action="store_true", help="Print every plan, not just failures")
+    args = parser.parse_args()
+
+    failures = run_checks(args.show)
+    if failures:
+        print(f"{failures} statement(s) use sequential scans on hot tables")
+        sys.exit(1)
+    print("All hot queries use indexes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+# In-memory stand-in for the Identity Toolkit REST API (accounts:signUp and
+# accounts:signInWithPassword), for tests and benchmarks. Point the app at it with
+# FIREBASE_AUTH_BASE_URL=http://localhost:9099/v1 and any FIREBASE_API_KEY.
+
+_users: dict[str, str] = {}
+_users_lock = threading.Lock()
+
+
+class IdentityHandler(BaseHTTPRequestHandler):
+    delay = 0.0
+    fail_status = 0
+
+    def _reply(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        payload = json.loads(self.rfile.read(length) or b"{}")
+        if self.delay:
+            time.sleep(self.delay)
+        if self.fail_status:
+            return self._reply(self.fail_status, {"error": {"message": "UNAVAILABLE"}})
+
+        action = urlparse(self.path).path.rsplit("accounts:", 1)[-1]
+        email, password = payload.get("email"), payload.get("password")
+        with _users_lock:
+            if action == "signUp":
+                if email in _users:
+                    return self._reply(400, {"error": {"message": "EMAIL_EXISTS"}})
+                _users[email] = password
+                return self._reply(200, {"email": email, "localId": email})
+            if action == "signInWithPassword":
+                if _users.get(email) != password:
+                    return self._reply(400, {"error": {"message": "INVALID_LOGIN_CREDENTIALS"}})
+                return self._reply(200, {"email": email, "localId": email, "registered": True})
+        self._reply(404, {"error": {"message": "NOT_FOUND"}})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake Firebase identity server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9099)
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds to stall every reply")
+    parser.add_argument("--fail-status", type=int, default=0, help="Answer every call with this status")
+    args = parser.parse_args()
+
+    IdentityHandler.delay = args.delay
+    IdentityHandler.fail_status = args.fail_status
+    server = ThreadingHTTPServer((args.host, args.port), IdentityHandler)
+    print(f"Fake identity server on http://{args.host}:{args.port}/v1")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+from decimal import Decimal
+
+import orjson
+from fastapi.responses import JSONResponse
+
+
+def _default(value):
+    # Exact: never round-trip money through float
+    if isinstance(value, Decimal):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson.
+
+    FastAPI hands the response class the same content as before (response_model
+    output already in JSON mode, other values through jsonable_encoder), so the
+    payloads are unchanged; only the encoding step is faster. Decimals passed in
+    directly are written as exact strings, as pydantic does.
+    """
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
@@ -0,0 +1,14 @@
+from sqlalchemy.orm import raiseload
+
+from app.config import settings
+
+
+def eager(*options):
+    """Loader options for read queries that feed response models.
+
+    With STRICT_RELATIONSHIP_LOADING enabled (tests), any relationship not loaded up
+    front raises instead of silently issuing one lazy query per row.
+    """
+    if settings.STRICT_RELATIONSHIP_LOADING:
+        return (*options, raiseload("*"))
+    return options
@@ -0,0 +1,35 @@
+import base64
+import json
+
+from fastapi import HTTPException, Response
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def encode_cursor(last_id: int) -> str:
+    raw = json.dumps({"id": last_id}).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return int(json.loads(base64.urlsafe_b64decode(padded))["id"])
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate(query, model_class, skip: int = 0, limit: int = 100, cursor: str | None = None) -> list:
+    """Keyset pagination on the primary key; `skip` is still honoured when no cursor is given."""
+    query = query.order_by(model_class.id)
+    if cursor:
+        query = query.filter(model_class.id > decode_cursor(cursor))
+    elif skip:
+        query = query.offset(skip)
+    return query.limit(limit).all()
+
+
+def set_next_cursor(response: Response, rows: list, limit: int) -> None:
+    """Advertise the cursor for the next page when this one came back full."""
+    if rows and len(rows) >= limit:
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].id)
@@ -0,0 +1,63 @@
+import threading
+import time
+from collections import OrderedDict
+
+from sqlalchemy.orm import make_transient_to_detached
+
+from app.config import settings
+from app.models.user import User
+
+_USER_COLUMNS = [attr.key for attr in User.__mapper__.column_attrs]
+
+
+class PrincipalCache:
+    """Bounded LRU + TTL cache of authenticated users, keyed by (user id, token iat).
+
+    Holds column snapshots rather than ORM instances so a hit can be attached
+    to the request's session without a SELECT.
+    """
+
+    def __init__(self, maxsize: int, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[int, int], tuple[float, dict]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return self.maxsize > 0 and self.ttl_seconds > 0
+
+    def get(self, user_id: int, issued_at: int) -> User | None:
+        key = (user_id, issued_at)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, values = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def put(self, user_id: int, issued_at: int, user: User):
+        values = {key: getattr(user, key) for key in _USER_COLUMNS}
+        with self._lock:
+            self._entries[(user_id, issued_at)] = (time.monotonic() + self.ttl_seconds, values)
+            self._entries.move_to_end((user_id, issued_at))
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: int):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL_SECONDS)
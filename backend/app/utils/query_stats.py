@@ -0,0 +1,91 @@
+import logging
+import time
+from contextvars import ContextVar
+
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Statement budgets for hot routes, keyed "METHOD /route/path".
+# Over budget is a warning, or a 500 when QUERY_BUDGET_ENFORCE is on. That is
+# for test suites only: the check runs after the handler, so any writes it
+# made are already committed when the 500 goes out.
+ROUTE_QUERY_BUDGETS: dict[str, int] = {
+    "GET /api/auth/me": 1,
+    "GET /api/products/public": 3,
+    "GET /api/products/public/search": 4,
+    "GET /api/products/public/{product_id}": 3,
+    "GET /api/subscriptions/": 3,
+    "GET /api/subscriptions/{sub_id}/history": 9,
+    "GET /api/invoices/": 3,
+    "POST /api/invoices/generate/{subscription_id}": 18,
+    "GET /api/cart/": 5,
+    "GET /api/reports/active-subscriptions": 5,
+    "GET /api/reports/revenue": 3,
+    "GET /api/reports/payments-summary": 4,
+    "GET /api/reports/overdue-invoices": 4,
+}
+
+
+class QueryStats:
+    """Statements run while serving one request."""
+
+    def __init__(self, scope: dict):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+
+    @property
+    def route_name(self) -> str:
+        route = self.scope.get("route")
+        path = route.path if route is not None else self.scope.get("path", "")
+        return f"{self.scope.get('method')} {path}"
+
+
+_current_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the per-statement context, so a statement that raises leaves nothing behind
+    context._query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._query_started
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.count += 1
+        stats.seconds += elapsed
+    if elapsed * 1000 >= settings.SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query (%.1f ms) on %s: %s",
+            elapsed * 1000, stats.route_name if stats else "-", statement,
+        )
+
+
+async def query_stats_middleware(request: Request, call_next):
+    stats = QueryStats(request.scope)
+    token = _current_stats.set(stats)
+    try:
+        response = await call_next(request)
+    finally:
+        _current_stats.reset(token)
+
+    route = stats.route_name
+    budget = ROUTE_QUERY_BUDGETS.get(route)
+    if budget is not None and stats.count > budget:
+        message = f"Query budget exceeded on {route}: {stats.count} statements (budget {budget})"
+        if settings.QUERY_BUDGET_ENFORCE:
+            return JSONResponse(status_code=500, content={"detail": message})
+        logger.warning(message)
+    response.headers.append(
+        "Server-Timing", f'db;dur={stats.seconds * 1000:.1f};desc="{stats.count} queries"'
+    )
+    return response
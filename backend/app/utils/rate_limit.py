@@ -0,0 +1,158 @@
+import logging
+import math
+import time
+
+from fastapi import HTTPException, Request, status
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+class MemoryBucketBackend:
+    """Per-process token buckets.
+
+    No lock: each bucket is a tuple swapped in with one dict assignment, so
+    concurrent threads can at worst both spend the same last token.
+    """
+
+    def __init__(self, max_keys: int = 100_000):
+        self.max_keys = max_keys
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    async def consume(self, key: str, rate_per_second: float, burst: int) -> float:
+        """Take one token; return 0 if allowed, else the seconds until one is available."""
+        now = time.monotonic()
+        tokens, updated = self._buckets.get(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate_per_second)
+        if tokens < 1:
+            self._buckets[key] = (tokens, now)
+            return (1 - tokens) / rate_per_second
+        self._buckets[key] = (tokens - 1, now)
+        if len(self._buckets) > self.max_keys:
+            self._prune(now, burst / rate_per_second)
+        return 0.0
+
+    def _prune(self, now: float, refill_seconds: float):
+        # Buckets idle long enough to be full again carry no state worth keeping
+        for key, (_, updated) in list(self._buckets.items()):
+            if now - updated >= refill_seconds:
+                self._buckets.pop(key, None)
+
+
+class RedisBucketBackend:
+    """Token buckets shared by every worker, kept in Redis (needs the `redis` package).
+
+    Uses the asyncio client so a round trip never blocks the event loop. While
+    Redis is unreachable the limiter fails open: requests are let through and
+    a warning is logged at most once a minute.
+    """
+
+    _SCRIPT = """
+    local burst = tonumber(ARGV[1])
+    local rate = tonumber(ARGV[2])
+    local now = tonumber(ARGV[3])
+    local state = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local tokens = tonumber(state[1]) or burst
+    local updated = tonumber(state[2]) or now
+    tokens = math.min(burst, tokens + (now - updated) * rate)
+    local wait = 0
+    if tokens < 1 then
+        wait = (1 - tokens) / rate
+    else
+        tokens = tokens - 1
+    end
+    redis.call('HSET', KEYS[1], 'tokens', tokens, 'updated', now)
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str, timeout: float):
+        import redis.asyncio
+        from redis.exceptions import RedisError
+
+        self._client = redis.asyncio.Redis.from_url(url, socket_timeout=timeout, socket_connect_timeout=timeout)
+        self._consume = self._client.register_script(self._SCRIPT)
+        self._errors = (RedisError, OSError)
+        self._warned_at = float("-inf")
+
+    async def consume(self, key: str, rate_per_second: float, burst: int) -> float:
+        try:
+            wait = await self._consume(keys=[f"ratelimit:{key}"], args=[burst, rate_per_second, time.time()])
+        except self._errors:
+            now = time.monotonic()
+            if now - self._warned_at >= 60:
+                self._warned_at = now
+                logger.warning("Rate limit store unavailable; letting auth requests through", exc_info=True)
+            return 0.0
+        return float(wait)
+
+
+def _make_backend():
+    if settings.RATE_LIMIT_BACKEND == "redis":
+        return RedisBucketBackend(settings.RATE_LIMIT_REDIS_URL, settings.RATE_LIMIT_REDIS_TIMEOUT)
+    return MemoryBucketBackend()
+
+
+rate_limit_backend = _make_backend()
+_auth_in_flight = 0
+
+
+def client_ip(request: Request) -> str:
+    if settings.RATE_LIMIT_TRUST_FORWARDED:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _too_many(wait: float) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many attempts, please retry later",
+        headers={"Retry-After": str(max(math.ceil(wait), 1))},
+    )
+
+
+async def auth_rate_limit(request: Request):
+    """Route dependency for the expensive auth endpoints.
+
+    Runs on the event loop before the DB session or the handler gets a
+    threadpool thread. It sheds load past AUTH_MAX_IN_FLIGHT, then applies
+    per-IP and per-email token buckets.
+    """
+    global _auth_in_flight
+    if not settings.RATE_LIMIT_ENABLED:
+        yield
+        return
+    if settings.AUTH_MAX_IN_FLIGHT and _auth_in_flight >= settings.AUTH_MAX_IN_FLIGHT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Authentication is busy, please retry shortly",
+            headers={"Retry-After": "1"},
+        )
+
+    scope = request.scope["route"].path
+    wait = await rate_limit_backend.consume(
+        f"{scope}:ip:{client_ip(request)}",
+        settings.RATE_LIMIT_IP_PER_MINUTE / 60, settings.RATE_LIMIT_IP_BURST,
+    )
+    if wait:
+        raise _too_many(wait)
+    try:
+        body = await request.json()
+    except Exception:
+        body = None
+    email = body.get("email") if isinstance(body, dict) else None
+    if isinstance(email, str) and email:
+        wait = await rate_limit_backend.consume(
+            f"{scope}:email:{email.strip().lower()}",
+            settings.RATE_LIMIT_EMAIL_PER_MINUTE / 60, settings.RATE_LIMIT_EMAIL_BURST,
+        )
+        if wait:
+            raise _too_many(wait)
+
+    _auth_in_flight += 1
+    try:
+        yield
+    finally:
+        _auth_in_flight -= 1
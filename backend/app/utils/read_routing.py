@@ -0,0 +1,27 @@
+from fastapi import Request
+
+from app.config import settings
+
+READ_PRIMARY_HEADER = "X-Read-Primary"
+# Sent after a successful write; the client echoes X-Read-Primary for this many seconds
+READ_PRIMARY_FOR_HEADER = "X-Read-Primary-For"
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+
+def reads_from_replica(request: Request) -> bool:
+    """GETs go to the replica unless the client asked to read its own recent writes."""
+    if not settings.REPLICA_DATABASE_URL or request.method not in SAFE_METHODS:
+        return False
+    return not request.headers.get(READ_PRIMARY_HEADER)
+
+
+async def read_your_writes_middleware(request: Request, call_next):
+    """After a successful write, tell the client how long to pin its reads to the primary.
+
+    The window lives with the client rather than in a cookie: the SPA calls the
+    API cross-origin without credentials, so cookies never come back.
+    """
+    response = await call_next(request)
+    if request.method not in SAFE_METHODS and response.status_code < 400:
+        response.headers[READ_PRIMARY_FOR_HEADER] = str(settings.READ_YOUR_WRITES_SECONDS)
+    return response
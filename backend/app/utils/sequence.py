@@ -1,10 +1,108 @@
+import threading
+from datetime import date
+
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from sqlalchemy import func
 
+from app.config import settings
+from app.models.document_sequence import DocumentSequence
 
-def generate_sequence(db: Session, model_class, prefix: str, number_field: str) -> str:
-    last = db.query(func.max(getattr(model_class, number_field))).scalar()
+
+def _existing_max(conn, model_class, number_field: str, key: str) -> int:
+    """Highest number already issued for a series, used once to seed its counter row."""
+    column = getattr(model_class, number_field)
+    # Order by length first so INV-10000 sorts above INV-9999
+    last = conn.execute(
+        select(column)
+        .where(column.like(f"{key}-%"), ~column.like(f"{key}-%-%"))
+        .order_by(func.length(column).desc(), column.desc())
+        .limit(1)
+    ).scalar()
     if last is None:
-        return f"{prefix}-0001"
-    num = int(last.split("-")[1]) + 1
-    return f"{prefix}-{num:04d}"
+        return 0
+    return int(last.rsplit("-", 1)[1])
+
+
+def _reserve(conn, key: str, count: int, seed) -> int:
+    """Advance a counter by `count` and return the new high value."""
+    table = DocumentSequence.__table__
+    hi = conn.execute(
+        update(table)
+        .where(table.c.key == key)
+        .values(last_value=table.c.last_value + count)
+        .returning(table.c.last_value)
+    ).scalar()
+    if hi is None:
+        hi = seed(conn) + count
+        conn.execute(insert(table).values(key=key, last_value=hi))
+    return hi
+
+
+class SequenceAllocator:
+    """Hands out document numbers from per-process blocks (hi/lo) of a counter row.
+
+    Blocks are reserved in their own short transaction, so concurrent requests never
+    wait on each other's open transactions. Numbers left in a block when the process
+    exits are skipped.
+    """
+
+    def __init__(self, block_size: int):
+        self.block_size = max(1, block_size)
+        self._blocks: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+
+    def allocate(self, db: Session, key: str, count: int, seed) -> list[int]:
+        bind = db.get_bind()
+        if bind.dialect.name == "sqlite":
+            # SQLite has a single writer: an autonomous transaction would wait on our own
+            # session, so reserve exactly what is needed inside it instead.
+            hi = _reserve(db.connection(), key, count, seed)
+            return list(range(hi - count + 1, hi + 1))
+
+        with self._lock:
+            values = []
+            while len(values) < count:
+                nxt, hi = self._blocks.get(key, (1, 0))
+                if nxt > hi:
+                    size = max(self.block_size, count - len(values))
+                    hi = self._reserve_block(bind.engine, key, size, seed)
+                    nxt = hi - size + 1
+                take = min(hi - nxt + 1, count - len(values))
+                values.extend(range(nxt, nxt + take))
+                self._blocks[key] = (nxt + take, hi)
+            return values
+
+    @staticmethod
+    def _reserve_block(engine, key: str, size: int, seed) -> int:
+        try:
+            with engine.begin() as conn:
+                return _reserve(conn, key, size, seed)
+        except IntegrityError:
+            # Another process created the counter row first; it exists now
+            with engine.begin() as conn:
+                return _reserve(conn, key, size, seed)
+
+
+_allocator = SequenceAllocator(settings.SEQUENCE_BLOCK_SIZE)
+
+
+def _series_key(prefix: str) -> str:
+    if settings.SEQUENCE_PER_YEAR:
+        return f"{prefix}-{date.today().year}"
+    return prefix
+
+
+def generate_sequence(db: Session, model_class, prefix: str, number_field: str) -> str:
+    return generate_sequence_block(db, model_class, prefix, number_field, 1)[0]
+
+
+def generate_sequence_block(db: Session, model_class, prefix: str, number_field: str,
+                            count: int) -> list[str]:
+    """Allocate `count` document numbers such as INV-0042 (or INV-2026-0042 per year)."""
+    key = _series_key(prefix)
+    numbers = _allocator.allocate(
+        db, key, count,
+        seed=lambda conn: _existing_max(conn, model_class, number_field, key),
+    )
+    return [f"{key}-{num:04d}" for num in numbers]
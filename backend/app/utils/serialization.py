@@ -0,0 +1,152 @@
+import enum
+import functools
+import types
+import typing
+from datetime import date, datetime
+from decimal import Decimal
+
+from fastapi import Response
+from pydantic import BaseModel, TypeAdapter
+
+from app.utils.conditional import copy_response_headers
+from app.utils.json_response import FastJSONResponse
+
+_MISSING = object()
+
+
+def _identity(value):
+    return value
+
+
+def _to_str(value):
+    return value.value if isinstance(value, enum.Enum) else value
+
+
+def _to_float(value):
+    return float(value)
+
+
+def _to_decimal_str(value):
+    return str(value) if isinstance(value, (Decimal, int)) else str(Decimal(str(value)))
+
+
+def _to_date(value):
+    return value.isoformat()
+
+
+def _to_datetime(value):
+    text = value.isoformat()
+    # pydantic writes UTC as "Z"
+    return text[:-6] + "Z" if text.endswith("+00:00") else text
+
+
+_SCALARS = {
+    int: _identity,
+    bool: _identity,
+    str: _to_str,
+    float: _to_float,
+    Decimal: _to_decimal_str,
+    date: _to_date,
+    datetime: _to_datetime,
+}
+
+
+def _converter(annotation):
+    """Return a function mapping a trusted value to its JSON-mode output, or None if unsupported."""
+    if annotation in _SCALARS:
+        return _SCALARS[annotation]
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+    if origin in (typing.Union, types.UnionType):
+        inner = [arg for arg in args if arg is not type(None)]
+        if len(inner) != 1 or len(args) != 2:
+            return None
+        convert = _converter(inner[0])
+        return None if convert is None else (lambda value: None if value is None else convert(value))
+    if origin is list and len(args) == 1:
+        convert = _converter(args[0])
+        return None if convert is None else (lambda value: [convert(item) for item in value])
+    if origin is dict and len(args) == 2 and args[0] is str:
+        convert = _converter(args[1])
+        return None if convert is None else (lambda value: {key: convert(item) for key, item in value.items()})
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return row_encoder(annotation)
+    return None
+
+
+def _is_plain(model: type[BaseModel]) -> bool:
+    """True when model output is just its attributes: no validators, serializers, aliases or computed fields."""
+    decorators = model.__pydantic_decorators__
+    if any((decorators.validators, decorators.field_validators, decorators.root_validators,
+            decorators.model_validators, decorators.field_serializers, decorators.model_serializers,
+            decorators.computed_fields)):
+        return False
+    return all(field.alias is None and field.serialization_alias is None for field in model.model_fields.values())
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter(model) -> TypeAdapter:
+    return TypeAdapter(model)
+
+
+def _validating_encoder(model: type[BaseModel]):
+    adapter = _adapter(model)
+    return lambda obj: adapter.dump_python(adapter.validate_python(obj, from_attributes=True), mode="json")
+
+
+@functools.lru_cache(maxsize=None)
+def row_encoder(model: type[BaseModel]):
+    """Build a function turning a trusted ORM row into the dict FastAPI would send for `model`.
+
+    Fields are read straight off the row and converted the way pydantic's
+    JSON mode writes them, without validating anything. Models that rely on
+    validators, serializers, aliases or field types not covered here fall
+    back to a cached TypeAdapter, which validates as before.
+    """
+    if not _is_plain(model):
+        return _validating_encoder(model)
+    fields = []
+    for name, field in model.model_fields.items():
+        convert = _converter(field.annotation)
+        if convert is None:
+            return _validating_encoder(model)
+        fields.append((name, convert, field))
+
+    def encode(obj) -> dict:
+        # Loaded column and relationship values sit in the instance dict; going
+        # through getattr only for the rest (unloaded attributes, properties)
+        # skips the descriptor on the hot path
+        loaded = getattr(obj, "__dict__", {})
+        out = {}
+        for name, convert, field in fields:
+            value = loaded.get(name, _MISSING)
+            if value is _MISSING:
+                value = getattr(obj, name, _MISSING)
+                if value is _MISSING:
+                    if field.is_required():
+                        raise AttributeError(f"{type(obj).__name__} has no attribute {name!r} for {model.__name__}")
+                    value = field.get_default(call_default_factory=True)
+            if value is None or convert is _identity:
+                out[name] = value
+            else:
+                out[name] = convert(value)
+        return out
+
+    return encode
+
+
+def dump_trusted(rows, model: type[BaseModel]) -> list[dict]:
+    """JSON-ready output for rows loaded from our own database, skipping re-validation."""
+    encode = row_encoder(model)
+    return [encode(row) for row in rows]
+
+
+def trusted_response(rows, model: type[BaseModel], response: Response | None = None) -> FastJSONResponse:
+    """Return rows as a list of `model` without FastAPI's response_model validation.
+
+    Keep `response_model` on the route so the OpenAPI schema is unchanged;
+    headers already set on the injected `response` are carried over.
+    """
+    result = FastJSONResponse(dump_trusted(rows, model))
+    if response is not None:
+        copy_response_headers(response, result)
+    return result
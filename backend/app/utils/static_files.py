@@ -0,0 +1,87 @@
+import os
+from urllib.parse import quote
+
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse, StaticFiles
+
+from app.config import settings
+from app.utils.uploads import HASHED_NAME_RE
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+ZEROCOPY_EXTENSION = "http.response.zerocopysend"
+PATHSEND_EXTENSION = "http.response.pathsend"
+
+
+class SendfileResponse(FileResponse):
+    """FileResponse that lets the ASGI server send the file itself when it offers to.
+
+    Servers advertising the zerocopysend extension get the open file (sendfile,
+    including single ranges); pathsend servers get the path. Otherwise the
+    bytes are streamed through Python as usual.
+    """
+
+    async def __call__(self, scope, receive, send):
+        self._extensions = scope.get("extensions") or {}
+        await super().__call__(scope, receive, send)
+
+    def _should_use_range(self, http_if_range: str, stat_result) -> bool:
+        # Compare with the headers actually sent, which may carry a content-hash ETag
+        return http_if_range in (self.headers.get("etag"), self.headers.get("last-modified"))
+
+    async def _handle_simple(self, send, send_header_only: bool) -> None:
+        if send_header_only:
+            return await super()._handle_simple(send, send_header_only)
+        if ZEROCOPY_EXTENSION in self._extensions:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            with open(self.path, "rb") as file:
+                await send({"type": ZEROCOPY_EXTENSION, "file": file})
+        elif PATHSEND_EXTENSION in self._extensions:
+            await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+            await send({"type": PATHSEND_EXTENSION, "path": str(self.path)})
+        else:
+            await super()._handle_simple(send, send_header_only)
+
+    async def _handle_single_range(self, send, start: int, end: int, file_size: int, send_header_only: bool) -> None:
+        if send_header_only or ZEROCOPY_EXTENSION not in self._extensions:
+            return await super()._handle_single_range(send, start, end, file_size, send_header_only)
+        self.headers["content-range"] = f"bytes {start}-{end - 1}/{file_size}"
+        self.headers["content-length"] = str(end - start)
+        await send({"type": "http.response.start", "status": 206, "headers": self.raw_headers})
+        with open(self.path, "rb") as file:
+            await send({"type": ZEROCOPY_EXTENSION, "file": file, "offset": start, "count": end - start})
+
+
+class UploadStaticFiles(StaticFiles):
+    """Static handler for /uploads.
+
+    Content-hashed files never change, so they are cached for a year as
+    immutable with an ETag taken from the hash (the same on every node).
+    Range and If-Range requests are honoured. With
+    UPLOADS_ACCEL_REDIRECT_PREFIX set, the response carries only headers and
+    an X-Accel-Redirect for the front proxy to serve the bytes.
+    """
+
+    def file_response(self, full_path, stat_result, scope, status_code: int = 200) -> Response:
+        name = os.path.basename(full_path)
+        hashed = HASHED_NAME_RE.match(name)
+        response = SendfileResponse(full_path, status_code=status_code, stat_result=stat_result)
+        if hashed:
+            response.headers["cache-control"] = IMMUTABLE_CACHE_CONTROL
+            response.headers["etag"] = f'"{os.path.splitext(name)[0]}"'
+        else:
+            response.headers["cache-control"] = f"public, max-age={settings.UPLOADS_MAX_AGE}"
+
+        if self.is_not_modified(response.headers, Headers(scope=scope)):
+            return NotModifiedResponse(response.headers)
+
+        if settings.UPLOADS_ACCEL_REDIRECT_PREFIX:
+            relative = os.path.relpath(full_path, self.directory).replace(os.sep, "/")
+            headers = {
+                key: response.headers[key]
+                for key in ("content-type", "cache-control", "etag", "last-modified")
+                if key in response.headers
+            }
+            headers["x-accel-redirect"] = f"{settings.UPLOADS_ACCEL_REDIRECT_PREFIX.rstrip('/')}/{quote(relative)}"
+            return Response(status_code=status_code, headers=headers)
+        return response
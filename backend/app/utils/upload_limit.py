@@ -0,0 +1,70 @@
+import json
+import re
+
+
+class _BodyTooLarge(Exception):
+    pass
+
+
+class UploadSizeLimitMiddleware:
+    """Cut off oversized upload bodies before the multipart parser spools them.
+
+    Requests to matching paths are rejected with 413 from their Content-Length,
+    or as soon as a chunked body grows past the limit.
+    """
+
+    def __init__(self, app, max_body_size: int, path_regex: str):
+        self.app = app
+        self.max_body_size = max_body_size
+        self.path_re = re.compile(path_regex)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] != "POST" or not self.path_re.match(scope["path"]):
+            await self.app(scope, receive, send)
+            return
+
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length and content_length.isdigit() and int(content_length) > self.max_body_size:
+            await self._reject(send)
+            return
+
+        received = 0
+        too_large = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, too_large
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    too_large = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def checked_send(message):
+            nonlocal response_started
+            if too_large:
+                # The app turned the aborted body into its own error; answer 413 instead
+                if message["type"] == "http.response.start":
+                    response_started = True
+                    await self._reject(send)
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, checked_send)
+        except _BodyTooLarge:
+            if not response_started:
+                await self._reject(send)
+
+    async def _reject(self, send):
+        body = json.dumps({"detail": "File too large"}).encode()
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())],
+        })
+        await send({"type": "http.response.body", "body": body})
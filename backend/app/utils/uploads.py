@@ -0,0 +1,16 @@
+import re
+
+UPLOAD_URL_PREFIX = "uploads/products/"
+THUMBNAIL_SIZES = (200, 800)
+# Content-addressed uploads: <32 hex digits of sha256><ext>, thumbnails <digest>_<size>.webp
+HASHED_NAME_RE = re.compile(r"^([0-9a-f]{32})(?:_(\d+))?\.[a-z]+$")
+
+
+def image_variants(image_url: str | None) -> dict[str, str]:
+    """Thumbnail URLs by width for a content-hashed image; legacy uploads have none."""
+    if not image_url or not image_url.startswith(UPLOAD_URL_PREFIX):
+        return {}
+    match = HASHED_NAME_RE.match(image_url[len(UPLOAD_URL_PREFIX):])
+    if not match or match.group(2):
+        return {}
+    return {str(size): f"{UPLOAD_URL_PREFIX}{match.group(1)}_{size}.webp" for size in THUMBNAIL_SIZES}
@@ -3,11 +3,21 @@ import os
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
 
+from app.config import settings
 from app.routes import api_router
 from app.exceptions import register_exception_handlers
+from app.services.api_key_service import api_key_table
+from app.services.auth_service import shutdown_hash_pool
+from app.services.firebase_keys import firebase_project_id, signing_keys
+from app.services.firebase_sync import password_sync_queue
+from app.services.image_service import MAX_FILE_SIZE, shutdown_image_pool
+from app.utils.query_stats import query_stats_middleware
+from app.utils.json_response import FastJSONResponse
+from app.utils.read_routing import READ_PRIMARY_FOR_HEADER, read_your_writes_middleware
+from app.utils.upload_limit import UploadSizeLimitMiddleware
 from app.utils.seed import seed_admin
+from app.utils.static_files import UploadStaticFiles
 
 UPLOADS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "uploads")
 os.makedirs(os.path.join(UPLOADS_DIR, "products"), exist_ok=True)
@@ -16,7 +26,16 @@ os.makedirs(os.path.join(UPLOADS_DIR, "products"), exist_ok=True)
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     seed_admin()
+    api_key_table.load()
+    api_key_table.start_sync()
+    if firebase_project_id():
+        signing_keys.start_background_refresh()
     yield
+    signing_keys.stop()
+    api_key_table.stop()
+    shutdown_hash_pool()
+    shutdown_image_pool()
+    password_sync_queue.stop()
 
 
 app = FastAPI(
@@ -24,6 +43,7 @@ app = FastAPI(
     version="1.0.0",
     description="Backend API for subscription lifecycle management",
     lifespan=lifespan,
+    default_response_class=FastJSONResponse,
 )
 
 app.add_middleware(
@@ -32,12 +52,20 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", READ_PRIMARY_FOR_HEADER],
 )
 
+# Leave room for the multipart framing around the file itself
+app.add_middleware(UploadSizeLimitMiddleware, max_body_size=MAX_FILE_SIZE + 64 * 1024,
+                   path_regex=r"^/api/products/\d+/image$")
+app.middleware("http")(query_stats_middleware)
+if settings.REPLICA_DATABASE_URL:
+    app.middleware("http")(read_your_writes_middleware)
+
 register_exception_handlers(app)
 app.include_router(api_router)
 
-app.mount("/uploads", StaticFiles(directory=UPLOADS_DIR), name="uploads")
+app.mount("/uploads", UploadStaticFiles(directory=UPLOADS_DIR), name="uploads")
 
 
 @app.get("/")
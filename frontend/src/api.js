@@ -7,16 +7,28 @@ const api = axios.create({
   headers: { 'Content-Type': 'application/json' },
 });
 
+// After a write, the API asks for reads to go to the primary database for a few seconds
+let readPrimaryUntil = 0;
+
 api.interceptors.request.use((config) => {
   const token = localStorage.getItem('access_token');
   if (token) {
     config.headers.Authorization = `Bearer ${token}`;
   }
+  if (Date.now() < readPrimaryUntil) {
+    config.headers['X-Read-Primary'] = '1';
+  }
   return config;
 });
 
 api.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    const seconds = Number(response.headers['x-read-primary-for']);
+    if (seconds > 0) {
+      readPrimaryUntil = Math.max(readPrimaryUntil, Date.now() + seconds * 1000);
+    }
+    return response;
+  },
   async (error) => {
     if (error.response?.status === 401) {
       const refreshToken = localStorage.getItem('refresh_token');